@@ -29,6 +29,12 @@ Requirements:
 """
 
 import argparse
+import logging
+import logging.handlers
+import math
+import queue
+import sched
+import threading
 import time
 import random
 
@@ -37,21 +43,74 @@ from src.manual_control import ManualControl
 from src.zenoh_publisher import ZenohPublisher
 from src.zenoh_subscriber import ZenohSubscriber
 
+logger = logging.getLogger(__name__)
+
+# Retry delay (seconds) for a background task that raised an exception
+TASK_ERROR_BACKOFF = 0.5
+
+
+def setup_logging():
+    """
+    Route this module's log records through a queue so that sensor callbacks
+    only enqueue them; a listener thread does the blocking stream writes.
+    
+    Returns:
+        logging.handlers.QueueListener: Started listener (stop it on exit)
+    """
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    listener.start()
+    return listener
+
 def main():
     """Main function to run CARLA manual driving."""
     # Parse argumenti
     parser = argparse.ArgumentParser(description='CARLA Manual Driving')
     parser.add_argument('--host', default='localhost', help='CARLA server host')
     parser.add_argument('--port', default=2000, type=int, help='CARLA server port')
+    parser.add_argument('--enable-adas', default=True, action=argparse.BooleanOptionalAction,
+                        help='Subscribe to ADAS commands that can override the driver')
+    parser.add_argument('--camera-size', default=(640, 360), type=int, nargs=2, metavar=('WIDTH', 'HEIGHT'),
+                        help='Camera capture resolution; smaller sizes cut sensor bandwidth and are scaled to the window')
+    parser.add_argument('--camera-cuda', default=False, action=argparse.BooleanOptionalAction,
+                        help='Convert camera frames BGRA->RGB on the GPU (OpenCV CUDA build, falls back to CPU)')
+    parser.add_argument('--raw-camera', default=False, action=argparse.BooleanOptionalAction,
+                        help='Publish camera frames as raw bytes on camera/frame_raw instead of base64 JSON on camera/frame')
+    parser.add_argument('--tick-message', default=False, action=argparse.BooleanOptionalAction,
+                        help='Publish all non-camera data as one telemetry/tick message per interval')
+    parser.add_argument('--jpeg-quality', default=None, type=int, choices=range(1, 101), metavar='QUALITY',
+                        help='JPEG-compress published camera frames with this quality (1-100, requires OpenCV)')
+    parser.add_argument('--binary-dynamics', default=False, action=argparse.BooleanOptionalAction,
+                        help='Publish speed/RPM as packed doubles on dynamics/speed/bin and dynamics/rpm/bin instead of JSON')
+    parser.add_argument('--batch-telemetry', default=False, action=argparse.BooleanOptionalAction,
+                        help='Publish speed/RPM only inside telemetry/full (one message per tick instead of three)')
     args = parser.parse_args()
     
-    # Initialize CARLA setup, Zenoh publisher and ADAS subscriber
-    carla_setup = CarlaSetup(args.host, args.port)
-    zenoh_publisher = ZenohPublisher(base_topic='carla/tesla', publish_interval=0.1)
-    adas_subscriber = ZenohSubscriber(base_topic='adas')
+    log_listener = setup_logging()
+    carla_setup = None
+    zenoh_publisher = None
+    adas_subscriber = None
     manual_control = None
+    scheduler_thread = None
     
     try:
+        # Initialize CARLA setup, Zenoh publisher and ADAS subscriber
+        carla_setup = CarlaSetup(args.host, args.port)
+        zenoh_publisher = ZenohPublisher(base_topic='carla/tesla', publish_interval=0.1,
+                                         batch_telemetry=args.batch_telemetry,
+                                         raw_camera=args.raw_camera,
+                                         tick_message=args.tick_message,
+                                         jpeg_quality=args.jpeg_quality,
+                                         binary_dynamics=args.binary_dynamics)
+        if args.enable_adas:
+            adas_subscriber = ZenohSubscriber(base_topic='adas')
+        
         # Connect to CARLA server
         if not carla_setup.connect_to_server():
             print("Greška: Nije moguće povezivanje sa CARLA serverom!")
@@ -64,7 +123,9 @@ def main():
             print("⚠️  Zenoh publisher nije dostupan - nastavljamo bez njega")
         
         # Connect ADAS subscriber
-        if adas_subscriber.connect():
+        if adas_subscriber is None:
+            print("ℹ️  ADAS subscriber isključen (--no-enable-adas)")
+        elif adas_subscriber.connect():
             print("✅ ADAS subscriber povezan")
         else:
             print("⚠️  ADAS subscriber nije dostupan - nastavljamo bez njega")
@@ -86,34 +147,35 @@ def main():
         
         # Setup obstacle sensor callback with Zenoh publishing
         def obstacle_callback(obstacle_data):
-            distance = obstacle_data['distance']
-            actor_type = obstacle_data['actor_type']
-            print(f"⚠️  PREPREKA DETEKTOVANA! Udaljenost: {distance:.1f}m, Tip: {actor_type}")
+            distance = obstacle_data.distance
+            actor_type = obstacle_data.actor_type
+            logger.warning("⚠️  PREPREKA DETEKTOVANA! Udaljenost: %.1fm, Tip: %s", distance, actor_type)
             zenoh_publisher.update_obstacle_distance(obstacle_data)
         
         # Setup collision sensor callback with Zenoh publishing
         def collision_callback(collision_data):
-            actor_type = collision_data['actor_type']
-            impulse = collision_data['impulse']
-            impulse_magnitude = (impulse['x']**2 + impulse['y']**2 + impulse['z']**2)**0.5
-            print(f"💥 KOLIZIJA! Sa: {actor_type}, Jačina udara: {impulse_magnitude:.2f}")
+            actor_type = collision_data.actor_type
+            impulse_magnitude = math.hypot(collision_data.impulse_x, collision_data.impulse_y, collision_data.impulse_z)
+            logger.warning("💥 KOLIZIJA! Sa: %s, Jačina udara: %.2f", actor_type, impulse_magnitude)
             zenoh_publisher.update_collision_status(collision_data)
         
-        carla_setup.setup_camera(camera_callback, resolution=(640, 360), fps=30)
+        carla_setup.setup_camera(camera_callback, resolution=tuple(args.camera_size), fps=30,
+                                 use_cuda=args.camera_cuda)
         carla_setup.setup_obstacle_sensor(obstacle_callback, detection_range=40.0)
         carla_setup.setup_collision_sensor(collision_callback)
         
         # Start Zenoh publishing
         zenoh_publisher.start_publishing()
         
-        print("Rezolucija: 640x360")
+        print(f"Rezolucija: {args.camera_size[0]}x{args.camera_size[1]}")
         print("Senzori: Obstacle (40m), Collision Detection")
         print("📡 Zenoh Publisher Topics:")
         for topic_name, topic_key in zenoh_publisher.get_topics().items():
             print(f"   {topic_name}: {topic_key}")
-        print("🚗 ADAS Subscriber Topics:")
-        for topic_name, topic_key in adas_subscriber.get_topics().items():
-            print(f"   {topic_name}: {topic_key}")
+        if adas_subscriber is not None:
+            print("🚗 ADAS Subscriber Topics:")
+            for topic_name, topic_key in adas_subscriber.get_topics().items():
+                print(f"   {topic_name}: {topic_key}")
         print("Kontrole: W-Gas, S-Brake, A/D-Steer, Q-HandBrake, ESC-Exit")
         print("Menjači: R-Veća brzina/Izlaz iz rikverca, F-Manja brzina/Ulazak u rikverc")
         print("🚶 Pešaci: Spawnuju se ispred vozila u smeru kretanja (70%) i sa strana (30%)")
@@ -127,55 +189,61 @@ def main():
         carla_setup.spawn_pedestrians_around_vehicle(5)
         print(f"🚶 Spawnovano {carla_setup.get_pedestrian_count()} pešaka oko vozila")
         
-        # Create a thread to periodically update vehicle data for Zenoh
-        import threading
-        def update_vehicle_data():
-            while True:
-                try:
-                    zenoh_publisher.update_vehicle_data(vehicle)
-                    time.sleep(0.05)  # Update every 50ms
-                except:
-                    break
-        
-        # Create a thread for pedestrian management
-        def manage_pedestrians():
-            last_spawn_time = time.time()
-            last_cleanup_time = time.time()
-            
-            while True:
-                try:
-                    current_time = time.time()
-                    
-                    # Spawn new pedestrians every 8-15 seconds
-                    if current_time - last_spawn_time > random.uniform(8, 15):
-                        # 70% chance for front spawning, 30% for side spawning
-                        if random.random() < 0.7:
-                            spawn_count = random.randint(1, 2)
-                            carla_setup.spawn_pedestrians_around_vehicle(spawn_count)
-                            print(f"🚶 Dodano {spawn_count} pešaka ispred vozila (ukupno: {carla_setup.get_pedestrian_count()})")
-                        else:
-                            left_count = random.randint(0, 1)
-                            right_count = random.randint(0, 1)
-                            if left_count > 0 or right_count > 0:
-                                carla_setup.spawn_pedestrians_at_sides(left_count, right_count)
-                                print(f"🚶 Dodano {left_count + right_count} pešaka sa strana (ukupno: {carla_setup.get_pedestrian_count()})")
-                        
-                        last_spawn_time = current_time
-                    
-                    # Cleanup distant pedestrians every 12 seconds
-                    if current_time - last_cleanup_time > 12:
-                        carla_setup.cleanup_distant_pedestrians()
-                        last_cleanup_time = current_time
-                    
-                    time.sleep(1)  # Check every second
-                except:
-                    break
-        
-        vehicle_thread = threading.Thread(target=update_vehicle_data, daemon=True)
-        pedestrian_thread = threading.Thread(target=manage_pedestrians, daemon=True)
-        
-        vehicle_thread.start()
-        pedestrian_thread.start()
+        # Single scheduler thread drives all periodic background work.
+        # shutdown.wait is the delay function, so setting the event wakes it early.
+        shutdown = threading.Event()
+        scheduler = sched.scheduler(time.monotonic, shutdown.wait)
+        
+        def schedule(delay, priority, action, argument=()):
+            if not shutdown.is_set():
+                scheduler.enter(delay, priority, action, argument)
+        
+        def run_task(name, func, *args):
+            # Failures are logged and the task is retried instead of silently
+            # killing the scheduler thread
+            try:
+                func(*args)
+                return True
+            except Exception as e:
+                logger.warning("Background task '%s' failed: %s", name, e)
+                return False
+        
+        def tick_vehicle():
+            ok = run_task('vehicle data', zenoh_publisher.update_vehicle_data, vehicle)
+            # Update every 50ms, back off after a failure
+            schedule(0.05 if ok else TASK_ERROR_BACKOFF, 1, tick_vehicle)
+        
+        def schedule_pedestrian_spawn():
+            # Next spawn (time, side and counts) is drawn once, when it is scheduled:
+            # every 8-15 seconds, 70% chance for front spawning, 30% for side spawning
+            if random.random() < 0.7:
+                plan = ('front', random.randint(1, 2), 0)
+            else:
+                plan = ('side', random.randint(0, 1), random.randint(0, 1))
+            schedule(random.uniform(8, 15), 2, tick_spawn_pedestrians, plan)
+        
+        def spawn_pedestrians(kind, first_count, second_count):
+            if kind == 'front':
+                carla_setup.spawn_pedestrians_around_vehicle(first_count)
+                print(f"🚶 Dodano {first_count} pešaka ispred vozila (ukupno: {carla_setup.get_pedestrian_count()})")
+            elif first_count > 0 or second_count > 0:
+                carla_setup.spawn_pedestrians_at_sides(first_count, second_count)
+                print(f"🚶 Dodano {first_count + second_count} pešaka sa strana (ukupno: {carla_setup.get_pedestrian_count()})")
+        
+        def tick_spawn_pedestrians(kind, first_count, second_count):
+            run_task('pedestrian spawn', spawn_pedestrians, kind, first_count, second_count)
+            schedule_pedestrian_spawn()
+        
+        def tick_cleanup_pedestrians():
+            run_task('pedestrian cleanup', carla_setup.cleanup_distant_pedestrians)
+            schedule(12, 2, tick_cleanup_pedestrians)  # Cleanup every 12 seconds
+        
+        schedule(0, 1, tick_vehicle)
+        schedule_pedestrian_spawn()
+        schedule(12, 2, tick_cleanup_pedestrians)
+        
+        scheduler_thread = threading.Thread(target=scheduler.run, daemon=True)
+        scheduler_thread.start()
         
         # Start manual control
         manual_control.run()
@@ -183,12 +251,24 @@ def main():
     except Exception as e:
         print(f"Greška: {e}")
     finally:
+        # Stop background tasks before tearing down what they use
+        if scheduler_thread is not None:
+            shutdown.set()
+            for event in scheduler.queue:
+                try:
+                    scheduler.cancel(event)
+                except ValueError:
+                    pass  # Event already started running
+            scheduler_thread.join(timeout=1.0)
+        
         # Cleanup resources
-        if 'adas_subscriber' in locals():
+        if adas_subscriber is not None:
             adas_subscriber.disconnect()
-        if 'zenoh_publisher' in locals():
+        if zenoh_publisher is not None:
             zenoh_publisher.disconnect()
-        carla_setup.cleanup()
+        if carla_setup is not None:
+            carla_setup.cleanup()
+        log_listener.stop()
 
 
 if __name__ == "__main__":
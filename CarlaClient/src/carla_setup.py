@@ -18,10 +18,62 @@ and managem        # Pronalaženje spawn tačaka
 """
 
 import carla
+import math
 import numpy as np
 import time
 import logging
+import queue
 import random
+import threading
+from collections import namedtuple
+
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+# Logging se podešava jednom, a svi CarlaSetup objekti dele isti logger
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+# Podaci koje senzori prosleđuju callback funkcijama
+ObstacleEvent = namedtuple('ObstacleEvent', 'frame timestamp distance actor actor_id actor_type')
+CollisionEvent = namedtuple('CollisionEvent', 'frame timestamp actor_id actor_type impulse_x impulse_y impulse_z')
+
+
+class FrameBufferPool:
+    """
+    Fixed ring of pre-allocated uint8 frame buffers reused round-robin.
+    
+    Buffers are not tracked after they are handed out: a frame is
+    overwritten once `count` newer frames have been produced (133 ms with 4
+    buffers at 30 FPS). Callbacks may use the frame right away, as
+    ManualControl.render_frame() does when it blits the latest frame; a
+    consumer that keeps it longer must copy it, as
+    ZenohPublisher.update_camera_frame() does.
+    """
+    
+    def __init__(self, shape, count=4):
+        """
+        Allocate the pool buffers.
+        
+        Args:
+            shape: Buffer shape, e.g. (height, width, 3)
+            count: Number of buffers in the ring
+        """
+        self.buffers = [np.empty(shape, dtype=np.uint8) for _ in range(count)]
+        self.index = 0
+    
+    def acquire(self):
+        """Get the next buffer in the ring (oldest frame, safe to overwrite)."""
+        buffer = self.buffers[self.index]
+        self.index = (self.index + 1) % len(self.buffers)
+        return buffer
 
 
 class CarlaSetup:
@@ -29,6 +81,20 @@ class CarlaSetup:
     Handles CARLA world, vehicle, camera and sensor setup and management.
     """
     
+    # Pozicije senzora u odnosu na vozilo (grade se jednom, pri učitavanju klase)
+    CAMERA_TRANSFORM = carla.Transform(
+        carla.Location(x=2.0, z=1.0),  # 2m napred, 1m visoko
+        carla.Rotation(pitch=0)        # Bez naginjanja
+    )
+    OBSTACLE_SENSOR_TRANSFORM = carla.Transform(
+        carla.Location(x=2.5, z=0.5),  # 2.5m napred, 0.5m visoko
+        carla.Rotation(pitch=0)        # Gleda pravo napred
+    )
+    COLLISION_SENSOR_TRANSFORM = carla.Transform(
+        carla.Location(x=0.0, z=0.0),  # Centar vozila
+        carla.Rotation(pitch=0)
+    )
+    
     def __init__(self, host='localhost', port=2000):
         """
         Initialize CARLA setup with connection parameters.
@@ -41,17 +107,37 @@ class CarlaSetup:
         self.port = port
         self.client = None
         self.world = None
+        self.blueprint_library = None
+        self.walker_blueprints = []
+        self.spawn_points = None
         self.vehicle = None
         self.camera = None
         self.obstacle_sensor = None
         self.collision_sensor = None
-        self.logger = self._setup_logging()
+        self.synchronous_mode = False
+        self.fps = 30
+        self.logger = logger
         self.camera_callback = None
         self.obstacle_callback = None
         self.collision_callback = None
         
+        # Camera frame buffer pool (pre-allocated in setup_camera)
+        self.camera_buffer_pool = None
+        
+        # Camera frames are processed on a worker thread, off the sensor thread
+        self.camera_queue = None
+        self.camera_worker = None
+        
+        # Shape of the raw BGRA frames from CARLA (set in setup_camera)
+        self.camera_raw_shape = None
+        
+        # Optional CUDA color conversion (enabled in setup_camera)
+        self.cuda_stream = None
+        self.cuda_bgra = None
+        self.cuda_rgb = None
+        
         # Pedestrian management
-        self.spawned_pedestrians = []
+        self.spawned_pedestrians = {}  # actor id -> walker actor
         self.max_pedestrians = 15
         self.pedestrian_spawn_distance = 50.0  # meters around vehicle
         
@@ -66,14 +152,6 @@ class CarlaSetup:
             'static.ground',
         ]
         
-    def _setup_logging(self):
-        """Setup logging system."""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s'
-        )
-        return logging.getLogger(__name__)
-    
     def connect_to_server(self):
         """
         Connect to CARLA server and get world instance.
@@ -82,40 +160,59 @@ class CarlaSetup:
             bool: True if connection successful, False otherwise
         """
         try:
-            self.logger.info(f"Connecting to CARLA server at {self.host}:{self.port}")
+            self.logger.info("Connecting to CARLA server at %s:%s", self.host, self.port)
             self.client = carla.Client(self.host, self.port)
             self.client.set_timeout(10.0)
             
             # Provera verzije
             version = self.client.get_server_version()
-            self.logger.info(f"CARLA server version: {version}")
+            self.logger.info("CARLA server version: %s", version)
             print("Successfully connected to CARLA simulator!")
             
             # Dobijanje sveta
             self.world = self.client.get_world()
             self.logger.info("Got CARLA world")
             
+            # Blueprint biblioteka i pešaci se keširaju jednom po konekciji
+            self.blueprint_library = self.world.get_blueprint_library()
+            self.walker_blueprints = list(self.blueprint_library.filter('walker.pedestrian.*'))
+            self.spawn_points = None  # Novi svet - spawn tačke se čitaju ponovo
+            
             return True
             
         except Exception as e:
-            self.logger.error(f"Connection error: {e}")
+            self.logger.error("Connection error: %s", e)
             return False
     
-    def setup_synchronous_mode(self, fps=30):
+    def setup_synchronous_mode(self, fps=30, max_substep_delta_time=0.01, max_substeps=10):
         """
         Setup synchronous mode for stable simulation.
         
+        Physics runs in substeps of at most max_substep_delta_time, so the
+        render rate (fps) can be lowered without degrading physics.
+        
         Args:
             fps: Target frames per second
+            max_substep_delta_time: Maximum physics substep in seconds
+            max_substeps: Maximum number of physics substeps per tick
         """
         if not self.world:
             raise RuntimeError("World nije inicijalizovan")
+        
+        fixed_delta_seconds = 1.0 / fps  # Convert FPS to delta time
+        if fixed_delta_seconds > max_substep_delta_time * max_substeps:
+            raise ValueError("fixed_delta_seconds mora biti <= max_substep_delta_time * max_substeps")
             
         settings = self.world.get_settings()
         settings.synchronous_mode = True
-        settings.fixed_delta_seconds = 1.0 / fps  # Convert FPS to delta time
+        settings.fixed_delta_seconds = fixed_delta_seconds
+        settings.substepping = True
+        settings.max_substep_delta_time = max_substep_delta_time
+        settings.max_substeps = max_substeps
         self.world.apply_settings(settings)
-        self.logger.info(f"Set synchronous mode with {fps} FPS")
+        self.synchronous_mode = True
+        self.fps = fps
+        self.logger.info("Set synchronous mode with %s FPS, physics substep %ss", fps, max_substep_delta_time)
     
     def spawn_vehicle(self, vehicle_type='vehicle.tesla.model3'):
         """
@@ -130,32 +227,36 @@ class CarlaSetup:
         if not self.world:
             raise RuntimeError("World nije inicijalizovan")
             
-        # Dobijanje blueprint biblioteke
-        blueprint_library = self.world.get_blueprint_library()
-        
         # Odabir vozila
-        vehicle_bp = blueprint_library.filter(vehicle_type)[0]
-        self.logger.info(f"Selected vehicle blueprint: {vehicle_type}")
+        vehicle_bp = self.blueprint_library.filter(vehicle_type)[0]
+        self.logger.info("Selected vehicle blueprint: %s", vehicle_type)
         
-        # Pronalaženje spawn tačaka
-        spawn_points = self.world.get_map().get_spawn_points()
-        if not spawn_points:
+        # Pronalaženje spawn tačaka (keširano po svetu)
+        if self.spawn_points is None:
+            self.spawn_points = self.world.get_map().get_spawn_points()
+        if not self.spawn_points:
             raise RuntimeError("No available spawn points!")
         
         # Odabir nasumične spawn tačke
-        spawn_point = random.choice(spawn_points)
-        self.logger.info(f"Selected spawn point: {spawn_point.location}")
+        spawn_point = random.choice(self.spawn_points)
+        self.logger.info("Selected spawn point: %s", spawn_point.location)
         
         # Spawn vozila
         self.vehicle = self.world.spawn_actor(vehicle_bp, spawn_point)
-        self.logger.info(f"Vehicle spawned with ID: {self.vehicle.id}")
+        self.logger.info("Vehicle spawned with ID: %s", self.vehicle.id)
         
-        # Wait for vehicle to stabilize
-        time.sleep(2)
+        # Wait for vehicle to stabilize (~2s of simulation time). In synchronous
+        # mode the server only advances when ticked, so sleeping would not help.
+        if self.synchronous_mode:
+            for _ in range(int(2 * self.fps)):
+                self.world.tick()
+        else:
+            time.sleep(2)
         
         return self.vehicle
     
-    def setup_camera(self, callback_function, resolution=(640, 360), fov=90, fps=30):
+    def setup_camera(self, callback_function, resolution=(640, 360), fov=90, fps=30, buffer_count=4,
+                     use_cuda=False):
         """
         Setup and attach RGB camera to the vehicle.
         
@@ -164,6 +265,9 @@ class CarlaSetup:
             resolution: Camera resolution as (width, height) tuple
             fov: Field of view in degrees
             fps: Camera frame rate
+            buffer_count: Number of pooled frame buffers reused round-robin
+            use_cuda: Do the BGRA->RGB conversion on the GPU (OpenCV CUDA build),
+                falls back to CPU when no CUDA device is available
             
         Returns:
             carla.Sensor: Camera sensor instance
@@ -172,29 +276,69 @@ class CarlaSetup:
             raise RuntimeError("World ili vehicle nisu inicijalizovani")
             
         # Kreiranje kamere
-        blueprint_library = self.world.get_blueprint_library()
-        camera_bp = blueprint_library.find('sensor.camera.rgb')
+        camera_bp = self.blueprint_library.find('sensor.camera.rgb')
         camera_bp.set_attribute('image_size_x', str(resolution[0]))
         camera_bp.set_attribute('image_size_y', str(resolution[1]))
         camera_bp.set_attribute('fov', str(fov))
         camera_bp.set_attribute('sensor_tick', str(1.0 / fps))
         
-        # Pozicija kamere (prednji deo vozila)
-        camera_transform = carla.Transform(
-            carla.Location(x=2.0, z=1.0),  # 2m napred, 1m visoko
-            carla.Rotation(pitch=0)        # Bez naginjanja
-        )
+        # Spawn camera (prednji deo vozila) and attach to vehicle
+        self.camera = self.world.spawn_actor(camera_bp, self.CAMERA_TRANSFORM, attach_to=self.vehicle)
+        self.logger.info("Camera created with ID: %s", self.camera.id)
         
-        # Spawn camera and attach to vehicle
-        self.camera = self.world.spawn_actor(camera_bp, camera_transform, attach_to=self.vehicle)
-        self.logger.info(f"Camera created with ID: {self.camera.id}")
+        self.camera_raw_shape = (resolution[1], resolution[0], 4)
         
-        # Registracija callback funkcije
+        # Pre-alokacija bafera za frejmove - izbegava alokaciju po frejmu
+        self.camera_buffer_pool = FrameBufferPool((resolution[1], resolution[0], 3), buffer_count)
+        
+        # GPU baferi se alociraju jednom i koriste za svaki frejm
+        if use_cuda:
+            if CV2_AVAILABLE and cv2.cuda.getCudaEnabledDeviceCount() > 0:
+                self.cuda_stream = cv2.cuda.Stream()
+                self.cuda_bgra = cv2.cuda_GpuMat(resolution[1], resolution[0], cv2.CV_8UC4)
+                self.cuda_rgb = cv2.cuda_GpuMat(resolution[1], resolution[0], cv2.CV_8UC3)
+                self.logger.info("Camera color conversion runs on CUDA")
+            else:
+                self.logger.warning("CUDA nije dostupan - konverzija kamere ostaje na CPU")
+        
+        # Registracija callback funkcije - CARLA nit samo ubacuje sliku u red,
+        # konverzija i korisnički callback se izvršavaju u worker niti
         self.camera_callback = callback_function
-        self.camera.listen(self._camera_callback_wrapper)
+        self.camera_queue = queue.Queue(maxsize=2)
+        self.camera_worker = threading.Thread(target=self._camera_worker_loop, daemon=True)
+        self.camera_worker.start()
+        self.camera.listen(self._enqueue_camera_image)
         
         return self.camera
     
+    def _enqueue_camera_image(self, image):
+        """
+        Sensor-thread callback: hand the CARLA image to the camera worker.
+        
+        Args:
+            image: CARLA image data
+        """
+        try:
+            self.camera_queue.put_nowait(image)
+        except queue.Full:
+            # Worker is behind: drop the oldest frame to keep latency bounded
+            try:
+                self.camera_queue.get_nowait()
+            except queue.Empty:
+                pass
+            self.camera_queue.put_nowait(image)
+    
+    def _camera_worker_loop(self):
+        """Process queued camera images until the None sentinel arrives."""
+        while True:
+            image = self.camera_queue.get()
+            if image is None:
+                break
+            try:
+                self._camera_callback_wrapper(image)
+            except Exception as e:
+                self.logger.error("Error processing camera frame: %s", e)
+    
     def _camera_callback_wrapper(self, image):
         """
         Internal wrapper for camera callback that processes CARLA image.
@@ -202,11 +346,21 @@ class CarlaSetup:
         Args:
             image: CARLA image data
         """
-        # Konvertuje CARLA sliku u numpy array
-        array = np.frombuffer(image.raw_data, dtype=np.dtype("uint8"))
-        array = np.reshape(array, (image.height, image.width, 4))
-        array = array[:, :, :3]  # Uklanja alpha kanal
-        array = array[:, :, ::-1]  # BGR to RGB za OpenCV
+        # Konvertuje CARLA sliku u numpy array (view bez kopiranja, BGRA)
+        bgra = np.frombuffer(image.raw_data, dtype=np.uint8).reshape(self.camera_raw_shape)
+        
+        # Uklanja alpha kanal i menja BGR u RGB u jednom prolazu,
+        # direktno u sledeći pre-alocirani bafer iz prstena
+        array = self.camera_buffer_pool.acquire()
+        if self.cuda_stream is not None:
+            self.cuda_bgra.upload(bgra, self.cuda_stream)
+            cv2.cuda.cvtColor(self.cuda_bgra, cv2.COLOR_BGRA2RGB, self.cuda_rgb, stream=self.cuda_stream)
+            self.cuda_rgb.download(self.cuda_stream, array)
+            self.cuda_stream.waitForCompletion()
+        elif CV2_AVAILABLE:
+            cv2.cvtColor(bgra, cv2.COLOR_BGRA2RGB, dst=array)
+        else:
+            np.copyto(array, bgra[:, :, 2::-1])
         
         # Poziv korisničke callback funkcije
         if self.camera_callback:
@@ -227,21 +381,14 @@ class CarlaSetup:
             raise RuntimeError("World ili vehicle nisu inicijalizovani")
             
         # Creating obstacle detection sensor
-        blueprint_library = self.world.get_blueprint_library()
-        obstacle_bp = blueprint_library.find('sensor.other.obstacle')
+        obstacle_bp = self.blueprint_library.find('sensor.other.obstacle')
         obstacle_bp.set_attribute('distance', str(detection_range))
         obstacle_bp.set_attribute('hit_radius', '0.5')
         obstacle_bp.set_attribute('only_dynamics', 'false')
         
-        # Sensor position (front of vehicle)
-        obstacle_transform = carla.Transform(
-            carla.Location(x=2.5, z=0.5),  # 2.5m napred, 0.5m visoko
-            carla.Rotation(pitch=0)        # Gleda pravo napred
-        )
-        
-        # Spawn senzora i attach na vozilo
-        self.obstacle_sensor = self.world.spawn_actor(obstacle_bp, obstacle_transform, attach_to=self.vehicle)
-        self.logger.info(f"Obstacle sensor created with ID: {self.obstacle_sensor.id}, range: {detection_range}m")
+        # Spawn senzora (front of vehicle) i attach na vozilo
+        self.obstacle_sensor = self.world.spawn_actor(obstacle_bp, self.OBSTACLE_SENSOR_TRANSFORM, attach_to=self.vehicle)
+        self.logger.info("Obstacle sensor created with ID: %s, range: %sm", self.obstacle_sensor.id, detection_range)
         
         # Registracija callback funkcije
         self.obstacle_callback = callback_function
@@ -257,21 +404,22 @@ class CarlaSetup:
         Args:
             event: CARLA obstacle detection event
         """
-        if self.obstacle_callback and event.other_actor:
-            actor_type = event.other_actor.type_id
+        actor = event.other_actor
+        if self.obstacle_callback and actor:
+            actor_type = actor.type_id
             
             # Check if this actor type should be ignored
             if any(ignored_type in actor_type for ignored_type in self.ignored_obstacle_types):
                 return  # Skip this obstacle - it's static infrastructure
             
-            obstacle_data = {
-                'frame': event.frame,
-                'timestamp': event.timestamp,
-                'distance': event.distance,
-                'actor': event.other_actor,
-                'actor_id': event.other_actor.id,
-                'actor_type': actor_type
-            }
+            obstacle_data = ObstacleEvent(
+                event.frame,
+                event.timestamp,
+                event.distance,
+                actor,
+                actor.id,
+                actor_type
+            )
             self.obstacle_callback(obstacle_data)
     
     def setup_collision_sensor(self, callback_function):
@@ -288,18 +436,11 @@ class CarlaSetup:
             raise RuntimeError("World ili vehicle nisu inicijalizovani")
             
         # Creating collision detection sensor
-        blueprint_library = self.world.get_blueprint_library()
-        collision_bp = blueprint_library.find('sensor.other.collision')
-        
-        # Sensor position (center of vehicle)
-        collision_transform = carla.Transform(
-            carla.Location(x=0.0, z=0.0),  # Centar vozila
-            carla.Rotation(pitch=0)
-        )
+        collision_bp = self.blueprint_library.find('sensor.other.collision')
         
-        # Spawn senzora i attach na vozilo
-        self.collision_sensor = self.world.spawn_actor(collision_bp, collision_transform, attach_to=self.vehicle)
-        self.logger.info(f"Collision sensor created with ID: {self.collision_sensor.id}")
+        # Spawn senzora (center of vehicle) i attach na vozilo
+        self.collision_sensor = self.world.spawn_actor(collision_bp, self.COLLISION_SENSOR_TRANSFORM, attach_to=self.vehicle)
+        self.logger.info("Collision sensor created with ID: %s", self.collision_sensor.id)
         
         # Registracija callback funkcije
         self.collision_callback = callback_function
@@ -315,17 +456,17 @@ class CarlaSetup:
             event: CARLA collision event
         """
         if self.collision_callback:
-            collision_data = {
-                'frame': event.frame,
-                'timestamp': event.timestamp,
-                'actor_id': event.other_actor.id if event.other_actor else None,
-                'actor_type': event.other_actor.type_id if event.other_actor else 'unknown',
-                'impulse': {
-                    'x': event.normal_impulse.x,
-                    'y': event.normal_impulse.y,
-                    'z': event.normal_impulse.z
-                }
-            }
+            actor = event.other_actor
+            impulse = event.normal_impulse
+            collision_data = CollisionEvent(
+                event.frame,
+                event.timestamp,
+                actor.id if actor else None,
+                actor.type_id if actor else 'unknown',
+                impulse.x,
+                impulse.y,
+                impulse.z
+            )
             self.collision_callback(collision_data)
     
     def cleanup(self):
@@ -347,6 +488,11 @@ class CarlaSetup:
             self.camera.destroy()
             self.logger.info("Camera destroyed")
         
+        if self.camera_worker:
+            self.camera_queue.put(None)
+            self.camera_worker.join(timeout=1.0)
+            self.camera_worker = None
+        
         if self.vehicle:
             self.vehicle.destroy()
             self.logger.info("Vehicle destroyed")
@@ -359,6 +505,7 @@ class CarlaSetup:
             settings = self.world.get_settings()
             settings.synchronous_mode = False
             self.world.apply_settings(settings)
+            self.synchronous_mode = False
             self.logger.info("Reset synchronous mode")
         
         self.logger.info("Resources successfully cleaned up")
@@ -399,43 +546,36 @@ class CarlaSetup:
         vehicle_location = vehicle_transform.location
         vehicle_rotation = vehicle_transform.rotation
         
-        # Get pedestrian blueprints
-        blueprint_library = self.world.get_blueprint_library()
-        walker_blueprints = blueprint_library.filter('walker.pedestrian.*')
+        # Get pedestrian blueprints (cached on connect)
+        walker_blueprints = self.walker_blueprints
         
         if not walker_blueprints:
             self.logger.warning("No available pedestrian blueprints")
             return
         
-        spawned_count = 0
-        attempts = 0
         max_attempts = count * 10
         
-        while spawned_count < count and attempts < max_attempts:
-            attempts += 1
-            
-            # Calculate forward direction from vehicle rotation
-            # Convert yaw to radians
-            yaw_rad = np.radians(vehicle_rotation.yaw)
-            
-            # Generate spawn position in front of vehicle with some randomness
-            forward_distance = random.uniform(15, self.pedestrian_spawn_distance)
-            
-            # Add some lateral offset (left/right from vehicle direction)
-            lateral_offset = random.uniform(-8, 8)  # meters left/right
-            
-            # Calculate position in front of vehicle
-            spawn_x = vehicle_location.x + forward_distance * np.cos(yaw_rad) + lateral_offset * np.cos(yaw_rad + np.pi/2)
-            spawn_y = vehicle_location.y + forward_distance * np.sin(yaw_rad) + lateral_offset * np.sin(yaw_rad + np.pi/2)
-            spawn_z = vehicle_location.z + 1.0  # Slightly above ground
-            
-            spawn_location = carla.Location(spawn_x, spawn_y, spawn_z)
-            
-            # Try to spawn pedestrian
-            if self._try_spawn_pedestrian(spawn_location, walker_blueprints):
-                spawned_count += 1
+        # Calculate forward direction from vehicle rotation (once per call)
+        # Convert yaw to radians; lateral (+90°) direction is (-sin, cos)
+        yaw_rad = math.radians(vehicle_rotation.yaw)
+        cos_yaw, sin_yaw = math.cos(yaw_rad), math.sin(yaw_rad)
+        
+        # Generate all candidate spawn positions in front of vehicle at once
+        forward_distance = np.random.uniform(15, self.pedestrian_spawn_distance, max_attempts)
+        lateral_offset = np.random.uniform(-8, 8, max_attempts)  # meters left/right
+        spawn_xs = vehicle_location.x + forward_distance * cos_yaw - lateral_offset * sin_yaw
+        spawn_ys = vehicle_location.y + forward_distance * sin_yaw + lateral_offset * cos_yaw
+        spawn_z = vehicle_location.z + 1.0  # Slightly above ground
+        
+        spawn_locations = [
+            carla.Location(spawn_x, spawn_y, spawn_z)
+            for spawn_x, spawn_y in zip(spawn_xs.tolist(), spawn_ys.tolist())
+        ]
         
-        self.logger.info(f"Spawned {spawned_count} pedestrians in front of vehicle")
+        # Try to spawn pedestrians (failed candidates are replaced by the next ones)
+        spawned_count = self._spawn_pedestrian_batch(spawn_locations, walker_blueprints, count)
+        
+        self.logger.info("Spawned %s pedestrians in front of vehicle", spawned_count)
 
     def spawn_pedestrians_at_sides(self, left_count=1, right_count=1):
         """
@@ -454,88 +594,87 @@ class CarlaSetup:
         vehicle_location = vehicle_transform.location
         vehicle_rotation = vehicle_transform.rotation
         
-        # Get pedestrian blueprints
-        blueprint_library = self.world.get_blueprint_library()
-        walker_blueprints = blueprint_library.filter('walker.pedestrian.*')
+        # Get pedestrian blueprints (cached on connect)
+        walker_blueprints = self.walker_blueprints
         
         if not walker_blueprints:
             self.logger.warning("Nema dostupnih pedestrian blueprints")
             return
         
-        yaw_rad = np.radians(vehicle_rotation.yaw)
-        spawned_total = 0
+        yaw_rad = math.radians(vehicle_rotation.yaw)
+        cos_yaw, sin_yaw = math.cos(yaw_rad), math.sin(yaw_rad)
+        spawn_z = vehicle_location.z + 1.0
+        spawn_locations = []
         
-        # Spawn on left side
-        for i in range(left_count):
-            if len(self.spawned_pedestrians) >= self.max_pedestrians:
-                break
-                
-            forward_distance = random.uniform(5, 25)
-            side_distance = random.uniform(3, 8)  # Left side distance
+        # Left side is 90 degrees counter-clockwise from forward, right side clockwise
+        for side_sign, side_count in ((1.0, left_count), (-1.0, right_count)):
+            forward_distance = np.random.uniform(5, 25, side_count)
+            side_distance = side_sign * np.random.uniform(3, 8, side_count)
+            spawn_xs = vehicle_location.x + forward_distance * cos_yaw - side_distance * sin_yaw
+            spawn_ys = vehicle_location.y + forward_distance * sin_yaw + side_distance * cos_yaw
             
-            # Calculate left side position (90 degrees counter-clockwise from forward)
-            spawn_x = vehicle_location.x + forward_distance * np.cos(yaw_rad) - side_distance * np.sin(yaw_rad)
-            spawn_y = vehicle_location.y + forward_distance * np.sin(yaw_rad) + side_distance * np.cos(yaw_rad)
-            spawn_z = vehicle_location.z + 1.0
-            
-            spawn_location = carla.Location(spawn_x, spawn_y, spawn_z)
-            
-            if self._try_spawn_pedestrian(spawn_location, walker_blueprints):
-                spawned_total += 1
+            spawn_locations.extend(
+                carla.Location(spawn_x, spawn_y, spawn_z)
+                for spawn_x, spawn_y in zip(spawn_xs.tolist(), spawn_ys.tolist())
+            )
         
-        # Spawn on right side
-        for i in range(right_count):
-            if len(self.spawned_pedestrians) >= self.max_pedestrians:
-                break
-                
-            forward_distance = random.uniform(5, 25)
-            side_distance = random.uniform(3, 8)  # Right side distance
-            
-            # Calculate right side position (90 degrees clockwise from forward)
-            spawn_x = vehicle_location.x + forward_distance * np.cos(yaw_rad) + side_distance * np.sin(yaw_rad)
-            spawn_y = vehicle_location.y + forward_distance * np.sin(yaw_rad) - side_distance * np.cos(yaw_rad)
-            spawn_z = vehicle_location.z + 1.0
-            
-            spawn_location = carla.Location(spawn_x, spawn_y, spawn_z)
-            
-            if self._try_spawn_pedestrian(spawn_location, walker_blueprints):
-                spawned_total += 1
+        # One attempt per side position, all in a single batch
+        spawned_total = self._spawn_pedestrian_batch(spawn_locations, walker_blueprints, len(spawn_locations))
         
-        self.logger.info(f"Spawned {spawned_total} pedestrians on vehicle sides")
+        self.logger.info("Spawned %s pedestrians on vehicle sides", spawned_total)
 
-    def _try_spawn_pedestrian(self, location, walker_blueprints):
+    def _spawn_pedestrian_batch(self, locations, walker_blueprints, count):
         """
-        Try to spawn a single pedestrian at given location.
+        Spawn up to `count` pedestrians from candidate locations.
+        
+        Each round sends one batch of SpawnActor commands (a single RPC);
+        candidates that fail to spawn are replaced by the next ones in the
+        following round.
         
         Args:
-            location: carla.Location where to spawn
+            locations: Candidate carla.Location list, in order of preference
             walker_blueprints: Available walker blueprints
+            count: Number of pedestrians wanted
             
         Returns:
-            bool: True if spawn successful
+            int: Number of pedestrians spawned
         """
+        spawned_count = 0
+        next_candidate = 0
+        
         try:
-            # Check if we have too many pedestrians already
-            if len(self.spawned_pedestrians) >= self.max_pedestrians:
-                return False
-            
-            # Select random pedestrian blueprint
-            walker_bp = random.choice(walker_blueprints)
-            
-            # Create spawn transform
-            spawn_transform = carla.Transform(location, carla.Rotation(yaw=random.uniform(0, 360)))
-            
-            # Try to spawn the pedestrian
-            pedestrian = self.world.try_spawn_actor(walker_bp, spawn_transform)
-            
-            if pedestrian:
-                self.spawned_pedestrians.append(pedestrian)
-                return True
+            while spawned_count < count and next_candidate < len(locations):
+                # Check if we have too many pedestrians already
+                free_slots = min(count - spawned_count,
+                                 self.max_pedestrians - len(self.spawned_pedestrians))
+                if free_slots <= 0:
+                    break
+                
+                batch = locations[next_candidate:next_candidate + free_slots]
+                next_candidate += len(batch)
+                
+                # Random blueprint and heading for each pedestrian, sampled in bulk
+                blueprints = random.choices(walker_blueprints, k=len(batch))
+                yaws = np.random.uniform(0, 360, len(batch)).tolist()
+                commands = [
+                    carla.command.SpawnActor(
+                        blueprint,
+                        carla.Transform(location, carla.Rotation(yaw=yaw))
+                    )
+                    for blueprint, location, yaw in zip(blueprints, batch, yaws)
+                ]
+                responses = self.client.apply_batch_sync(commands)
+                
+                actor_ids = [response.actor_id for response in responses if not response.error]
+                if actor_ids:
+                    for pedestrian in self.world.get_actors(actor_ids):
+                        self.spawned_pedestrians[pedestrian.id] = pedestrian
+                    spawned_count += len(actor_ids)
             
         except Exception as e:
-            self.logger.warning(f"Error spawning pedestrian: {e}")
+            self.logger.warning("Error spawning pedestrians: %s", e)
         
-        return False
+        return spawned_count
 
     def cleanup_distant_pedestrians(self):
         """Remove pedestrians that are too far from the vehicle."""
@@ -547,29 +686,46 @@ class CarlaSetup:
         
         pedestrians_to_remove = []
         
-        for pedestrian in self.spawned_pedestrians:
+        # Snapshot pedestrian locations once
+        located_pedestrians = []
+        ped_locations = []
+        for pedestrian in self.spawned_pedestrians.values():
             try:
                 ped_location = pedestrian.get_location()
-                distance = vehicle_location.distance(ped_location)
-                
-                if distance > cleanup_distance:
-                    pedestrians_to_remove.append(pedestrian)
-            except:
+                ped_locations.append((ped_location.x, ped_location.y, ped_location.z))
+                located_pedestrians.append(pedestrian)
+            except Exception:
                 # Pedestrian might be already destroyed
                 pedestrians_to_remove.append(pedestrian)
         
-        # Remove distant pedestrians
-        for pedestrian in pedestrians_to_remove:
-            try:
-                pedestrian.destroy()
-                self.spawned_pedestrians.remove(pedestrian)
-            except:
-                # Pedestrian might be already destroyed
-                if pedestrian in self.spawned_pedestrians:
-                    self.spawned_pedestrians.remove(pedestrian)
+        # Squared distances for all pedestrians at once (no sqrt)
+        if ped_locations:
+            offsets = np.array(ped_locations) - (vehicle_location.x, vehicle_location.y, vehicle_location.z)
+            distances_sq = np.einsum('ij,ij->i', offsets, offsets)
+            for index in np.flatnonzero(distances_sq > cleanup_distance * cleanup_distance):
+                pedestrians_to_remove.append(located_pedestrians[index])
         
+        # Remove distant pedestrians
         if pedestrians_to_remove:
-            self.logger.info(f"Removed {len(pedestrians_to_remove)} distant pedestrians")
+            self._destroy_actors(pedestrians_to_remove)
+            for pedestrian in pedestrians_to_remove:
+                self.spawned_pedestrians.pop(pedestrian.id, None)
+            self.logger.info("Removed %s distant pedestrians", len(pedestrians_to_remove))
+
+    def _destroy_actors(self, actors):
+        """
+        Destroy actors with a single batch of DestroyActor commands.
+        
+        Args:
+            actors: Actors to destroy (already destroyed ones are ignored by the server)
+        """
+        if not actors or not self.client:
+            return
+        
+        try:
+            self.client.apply_batch([carla.command.DestroyActor(actor.id) for actor in actors])
+        except Exception as e:
+            self.logger.warning("Error destroying actors: %s", e)
 
     def get_pedestrian_count(self):
         """Get current number of spawned pedestrians."""
@@ -577,12 +733,7 @@ class CarlaSetup:
 
     def cleanup_all_pedestrians(self):
         """Remove all spawned pedestrians."""
-        for pedestrian in self.spawned_pedestrians:
-            try:
-                pedestrian.destroy()
-            except:
-                pass  # Pedestrian might be already destroyed
-        
+        self._destroy_actors(list(self.spawned_pedestrians.values()))
         self.spawned_pedestrians.clear()
         self.logger.info("Removed all pedestrians")
 
@@ -594,7 +745,7 @@ class CarlaSetup:
             ignored_types: List of actor type strings to ignore
         """
         self.ignored_obstacle_types = ignored_types
-        self.logger.info(f"Ažurirane ignorisane prepreke: {ignored_types}")
+        self.logger.info("Ažurirane ignorisane prepreke: %s", ignored_types)
 
     def add_ignored_obstacle_type(self, obstacle_type):
         """
@@ -605,7 +756,7 @@ class CarlaSetup:
         """
         if obstacle_type not in self.ignored_obstacle_types:
             self.ignored_obstacle_types.append(obstacle_type)
-            self.logger.info(f"Dodana ignorisana prepreka: {obstacle_type}")
+            self.logger.info("Dodana ignorisana prepreka: %s", obstacle_type)
 
     def get_ignored_obstacle_types(self):
         """Get current list of ignored obstacle types."""
@@ -9,6 +9,8 @@ using keyboard input and displays the live camera feed.
 import carla
 import pygame
 import numpy as np
+import queue
+import threading
 
 
 class ManualControl:
@@ -46,15 +48,33 @@ class ManualControl:
         }
         self.max_gear = 6
         self.reverse_gear = 0
+        # Kvadrat limita brzine (m/s)^2 po brzini, računa se jednom
+        self.max_speed_sq_by_gear = {gear: (speed / 3.6) ** 2 for gear, speed in self.gear_speeds.items()}
+        self.max_speed_sq = self.max_speed_sq_by_gear[self.current_gear]
+        
+        # Tasteri za vožnju (W, S, A, D, Q) vezani jednom, čitaju se svaki frejm
+        self.drive_keys = (pygame.K_w, pygame.K_s, pygame.K_a, pygame.K_d, pygame.K_q)
         
         # Pygame setup
         pygame.init()
-        self.display = pygame.display.set_mode((640, 360))
+        # SCALED: prikaz ide preko GPU teksture umesto softverskog kopiranja na flip
+        self.display = pygame.display.set_mode((640, 360), pygame.DOUBLEBUF | pygame.SCALED, vsync=0)
         pygame.display.set_caption('CARLA Manual Driving - WASD Controls')
         self.clock = pygame.time.Clock()
+        # U red ulaze samo događaji koje petlja obrađuje (filtrira SDL, ne Python)
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed([pygame.QUIT, pygame.KEYDOWN])
         
         self.running = True
         self.current_image = None
+        # Surface za frejmove koji nisu iste veličine kao prozor, pravi se jednom
+        self.frame_surface = None
+        
+        # Tick nit: primenjuje poslednju kontrolu i pomera simulaciju,
+        # paralelno sa renderovanjem u glavnoj petlji
+        self.control_queue = queue.Queue(maxsize=1)
+        self.tick_thread = None
+        self.vehicle_velocity = None  # Brzina iz poslednjeg world snapshot-a
 
     def set_current_image(self, image):
         """
@@ -76,12 +96,14 @@ class ManualControl:
             self.current_gear += 1
             self.is_reverse_mode = False
             print(f"🔧 Prebačeno na {self.current_gear}. brzinu")
+        self.update_speed_limit()
 
     def shift_gear_down(self):
         """Shift to lower gear."""
         if self.current_gear > 1:
             self.current_gear -= 1
             self.is_reverse_mode = False
+            self.update_speed_limit()
             print(f"🔧 Prebačeno na {self.current_gear}. brzinu")
         elif self.current_gear == 1:
             # From 1st gear, go to reverse
@@ -91,8 +113,14 @@ class ManualControl:
         """Shift to reverse gear."""
         self.current_gear = self.reverse_gear
         self.is_reverse_mode = True
+        self.update_speed_limit()
         print("🔧 Prebačeno u rikverc")
 
+    def update_speed_limit(self):
+        """Refresh the cached squared speed limit after a gear change."""
+        gear = self.reverse_gear if self.is_reverse_mode else self.current_gear
+        self.max_speed_sq = self.max_speed_sq_by_gear.get(gear, (50 / 3.6) ** 2)
+
     def get_gear_name(self):
         """Get display name for current gear."""
         if self.is_reverse_mode:
@@ -109,79 +137,118 @@ class ManualControl:
     def process_input(self):
         """Procesira input sa tastature."""
         keys = pygame.key.get_pressed()
+        key_w, key_s, key_a, key_d, key_q = (keys[k] for k in self.drive_keys)
         
-        # Reset control
-        self.control.throttle = 0.0
-        self.control.brake = 0.0
-        self.control.steer = 0.0
-        self.control.hand_brake = False
-        
-        # Get current vehicle speed
-        velocity = self.vehicle.get_velocity()
-        current_speed = 3.6 * (velocity.x**2 + velocity.y**2 + velocity.z**2)**0.5
-        max_speed = self.get_max_speed_for_gear()
-        
-        # Throttle (W) - gas (forward or reverse depending on current gear)
-        if keys[pygame.K_w]:
-            if current_speed < max_speed:
-                self.control.throttle = 0.8
-                # Set reverse mode based on current gear
-                if self.is_reverse_mode:
-                    self.control.reverse = True
-                else:
-                    self.control.reverse = False
-            else:
-                self.control.throttle = 0.2  # Reduced throttle when at speed limit
-                if self.is_reverse_mode:
-                    self.control.reverse = True
+        # Brzina se poredi na kvadrat (m/s), bez sqrt; brzina iz poslednjeg
+        # snapshot-a tick niti, pre prvog tick-a direktno sa vozila
+        velocity = self.vehicle_velocity
+        if velocity is None:
+            velocity = self.vehicle.get_velocity()
+        speed_sq = velocity.x * velocity.x + velocity.y * velocity.y + velocity.z * velocity.z
+        
+        # Throttle (W) - 0.8 ispod limita brzine, 0.2 na limitu
+        self.control.throttle = key_w * (0.2 + 0.6 * (speed_sq < self.max_speed_sq))
+        if key_w:
+            # Forward or reverse depending on current gear
+            self.control.reverse = self.is_reverse_mode
         
         # Brake (S) - always brake, never change gear
-        if keys[pygame.K_s]:
-            self.control.brake = 0.8
+        self.control.brake = 0.8 * key_s
+        if key_s:
             self.control.reverse = False  # Stop any movement when braking
         
-        # Steer left (A)
-        if keys[pygame.K_a]:
-            self.control.steer = -0.5
-        
-        # Steer right (D)
-        if keys[pygame.K_d]:
-            self.control.steer = 0.5
+        # Steer (A/D) - D ima prednost kada su oba pritisnuta
+        self.control.steer = 0.5 if key_d else -0.5 * key_a
         
         # Hand brake (Q)
-        if keys[pygame.K_q]:
-            self.control.hand_brake = True
+        self.control.hand_brake = bool(key_q)
         
         # Apply ADAS overrides if subscriber is available
         if self.adas_subscriber:
-            # Check lane assist override
-            la_active, la_angle = self.adas_subscriber.get_lane_assist_override()
-            if la_active:
-                self.control.steer = la_angle  # Override driver steering
+            # Latest ADAS state pushed by the Zenoh subscriber callbacks
+            la_active, la_angle, eb_active, eb_force = self.adas_subscriber.get_overrides()
+            la_weight = float(la_active)
+            eb_weight = float(eb_active)
+            
+            # Lane assist override - težina 1.0 zamenjuje upravljanje vozača
+            self.control.steer = self.control.steer * (1.0 - la_weight) + la_angle * la_weight
             
-            # Check emergency brake override
-            eb_active, eb_force = self.adas_subscriber.get_emergency_brake_override()
-            if eb_active:
-                self.control.brake = eb_force  # Override driver brake
-                self.control.throttle = 0.0    # Cut throttle when emergency braking
+            # Emergency brake override - zamenjuje kočnicu i gasi gas
+            self.control.brake = self.control.brake * (1.0 - eb_weight) + eb_force * eb_weight
+            self.control.throttle *= 1.0 - eb_weight
         
-        # Primeni kontrol na vozilo
-        self.vehicle.apply_control(self.control)
+        # Predaj kopiju kontrole tick niti (self.control se menja u sledećem frejmu)
+        self.submit_control(carla.VehicleControl(
+            throttle=self.control.throttle,
+            steer=self.control.steer,
+            brake=self.control.brake,
+            hand_brake=self.control.hand_brake,
+            reverse=self.control.reverse))
+
+    def submit_control(self, control):
+        """
+        Hand a control to the tick thread, replacing one that was not applied yet.
+        
+        Args:
+            control: carla.VehicleControl to apply on the next world tick
+        """
+        try:
+            self.control_queue.put_nowait(control)
+        except queue.Full:
+            # Tick thread is behind: drop the stale control, keep the newest
+            try:
+                self.control_queue.get_nowait()
+            except queue.Empty:
+                pass
+            self.control_queue.put_nowait(control)
+
+    def _tick_loop(self):
+        """Primenjuje kontrolu i tick-uje svet, jedan tick po frejmu glavne petlje."""
+        while self.running:
+            try:
+                control = self.control_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            try:
+                # Primeni kontrol na vozilo - kroz batch kanal klijenta kada je dostupan
+                if self.carla_setup is not None and self.carla_setup.client is not None:
+                    self.carla_setup.client.apply_batch(
+                        [carla.command.ApplyVehicleControl(self.vehicle.id, control)])
+                else:
+                    self.vehicle.apply_control(control)
+                # Tick world u sinhronizovanom modu
+                self.world.tick()
+                # Stanje vozila iz jednog snapshot-a umesto posebnih upita
+                actor_snapshot = self.world.get_snapshot().find(self.vehicle.id)
+                if actor_snapshot is not None:
+                    self.vehicle_velocity = actor_snapshot.get_velocity()
+            except Exception as e:
+                print(f"Greška u tick niti: {e}")
+                self.running = False
 
     def render_frame(self):
         """Renderuje trenutni frame sa kamere."""
-        if self.current_image is not None:
-            # Konvertuj OpenCV format u pygame
-            image_surface = pygame.surfarray.make_surface(self.current_image.swapaxes(0, 1))
-            
-            # Skaliraj na display veličinu
-            image_surface = pygame.transform.scale(image_surface, (640, 360))
-            self.display.blit(image_surface, (0, 0))
+        image = self.current_image
+        if image is not None:
+            # pygame očekuje (W, H, 3) - transpose je samo view bez kopiranja
+            frame = image.swapaxes(0, 1)
+            if frame.shape[:2] == self.display.get_size():
+                # Ista veličina kao prozor: upis direktno u display, bez
+                # međusurface-a i skaliranja
+                pygame.surfarray.blit_array(self.display, frame)
+            else:
+                if self.frame_surface is None or self.frame_surface.get_size() != frame.shape[:2]:
+                    self.frame_surface = pygame.Surface(frame.shape[:2])
+                pygame.surfarray.blit_array(self.frame_surface, frame)
+                # Skaliranje upisuje direktno u display, bez nove surface
+                pygame.transform.scale(self.frame_surface, self.display.get_size(), self.display)
         
         pygame.display.flip()
 
     def run(self):
         """Glavna petlja za ručno upravljanje."""
+        self.tick_thread = threading.Thread(target=self._tick_loop, daemon=True)
+        self.tick_thread.start()
         try:
             while self.running:
                 # Handle events
@@ -202,13 +269,10 @@ class ManualControl:
                         elif event.key == pygame.K_f:
                             self.shift_gear_down()
                 
-                # Process input and update vehicle
+                # Process input and hand control to the tick thread
                 self.process_input()
                 
-                # Tick world u sinhronizovanom modu
-                self.world.tick()
-                
-                # Render frame
+                # Render frame (world.tick() teče paralelno u tick niti)
                 self.render_frame()
                 
                 # Control frame rate
@@ -217,4 +281,6 @@ class ManualControl:
         except KeyboardInterrupt:
             print("Manual control interrupted")
         finally:
+            self.running = False
+            self.tick_thread.join(timeout=1.0)
             pygame.quit()
\ No newline at end of file
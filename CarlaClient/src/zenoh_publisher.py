@@ -9,12 +9,98 @@ and sensor data through Zenoh messaging system to separate topics.
 import zenoh
 import json
 import base64
+import math
+import queue
+import struct
 import time
 import threading
 import logging
 from datetime import datetime
 import numpy as np
 
+from .zenoh_session import acquire_session, release_session
+
+try:
+    import pybase64
+    PYBASE64_AVAILABLE = True
+except ImportError:
+    PYBASE64_AVAILABLE = False
+
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# Raw camera frame metadata, sent as a fixed 28-byte Zenoh attachment:
+# height, width, channels, dtype code, codec code (uint32) and timestamp (float64)
+FRAME_META = struct.Struct('<IIIIId')
+FRAME_DTYPES = ('uint8', 'uint16', 'float32')
+FRAME_CODECS = ('raw', 'jpeg')
+
+# Binary speed/RPM payload (binary_dynamics=True): two little-endian doubles,
+# (speed_kmh, speed_ms) on dynamics/speed/bin and (rpm, engine_load) on
+# dynamics/rpm/bin. The key expression, not the payload, tells the format.
+DYNAMICS_VALUES = struct.Struct('<dd')
+
+
+def encode_json(data):
+    """
+    Serialize a message to UTF-8 JSON bytes, using orjson when it is installed.
+    
+    Args:
+        data: JSON-serializable message
+        
+    Returns:
+        bytes: Encoded payload
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data)
+    return json.dumps(data).encode('utf-8')
+
+
+def json_number(value):
+    """
+    Map a float to a JSON-safe value: NaN and infinity are not valid JSON.
+    
+    Args:
+        value: Float to publish
+        
+    Returns:
+        float or None: The value, or None (JSON null) if it is not finite
+    """
+    return value if math.isfinite(value) else None
+
+
+def collision_to_dict(collision):
+    """
+    Convert a CollisionEvent to its published JSON structure.
+    
+    Args:
+        collision: CollisionEvent from the collision sensor
+        
+    Returns:
+        dict: Collision data with nested impulse vector
+    """
+    return {
+        'frame': collision.frame,
+        'timestamp': collision.timestamp,
+        'actor_id': collision.actor_id,
+        'actor_type': collision.actor_type,
+        'impulse': {
+            'x': collision.impulse_x,
+            'y': collision.impulse_y,
+            'z': collision.impulse_z
+        }
+    }
+
 
 class ZenohPublisher:
     """
@@ -22,30 +108,77 @@ class ZenohPublisher:
     Each data type is published to a separate topic.
     """
     
-    def __init__(self, base_topic='carla/vehicle', publish_interval=0.1):
+    # Fixed-schema messages are %-formatted from precompiled JSON templates
+    # instead of building and serializing a dict on every publish. Values are
+    # rounded to 3 decimals (timestamp to 6); %f would print nan/inf, which is
+    # not valid JSON, so non-finite values go through encode_json as null.
+    OBSTACLE_TEMPLATE = b'{"timestamp":%.6f,"distance_meters":%.3f,"status":"%s"}'
+    SPEED_TEMPLATE = b'{"timestamp":%.6f,"speed_kmh":%.3f,"speed_ms":%.3f}'
+    RPM_TEMPLATE = b'{"timestamp":%.6f,"rpm":%.3f,"engine_load":%.3f}'
+    CAMERA_FRAME_HEADER = b'{"timestamp":%.6f,"shape":%s,"dtype":"%s","codec":"%s","data":"'
+    
+    def __init__(self, base_topic='carla/vehicle', publish_interval=0.1, batch_telemetry=False,
+                 raw_camera=False, tick_message=False, jpeg_quality=None, binary_dynamics=False):
         """
         Initialize Zenoh publisher with base topic and publishing interval.
         
         Args:
             base_topic: Base topic name for all publications
             publish_interval: Publishing interval in seconds (default 100ms)
+            batch_telemetry: Publish vehicle dynamics only as one telemetry record
+                per tick instead of separate speed/RPM messages
+            raw_camera: Publish camera frames as raw pixel bytes on camera/frame_raw
+                (metadata in the Zenoh attachment) instead of base64 JSON on camera/frame
+            tick_message: Publish all non-camera data as one telemetry/tick message
+                per publish interval instead of one message per topic
+            jpeg_quality: JPEG-compress camera frames with this quality (1-100)
+                before publishing; None sends uncompressed pixels (requires OpenCV)
+            binary_dynamics: Publish speed and RPM as two packed doubles
+                (DYNAMICS_VALUES) on dynamics/speed/bin and dynamics/rpm/bin instead
+                of JSON on dynamics/speed and dynamics/rpm; the receive time is the timestamp
         """
         self.base_topic = base_topic
         self.publish_interval = publish_interval
+        self.batch_telemetry = batch_telemetry
+        self.raw_camera = raw_camera
+        self.tick_message = tick_message
+        self.binary_dynamics = binary_dynamics
         self.session = None
         self.publishers = {}
         self.running = False
         self.publish_thread = None
         self.logger = self._setup_logging()
         
+        self.jpeg_quality = jpeg_quality
+        if jpeg_quality is not None and not CV2_AVAILABLE:
+            self.logger.warning("OpenCV nije dostupan - frejmovi kamere se šalju bez JPEG kompresije")
+            self.jpeg_quality = None
+        
         # Data storage
-        self.current_frame = None
+        # Single-slot latest-frame queue: the camera thread replaces an unsent
+        # frame, the publishing thread takes each frame at most once
+        self.frame_queue = queue.Queue(maxsize=1)
+        # Publisher-owned frame copies. The camera ring buffers are reused
+        # after a few frames, so a frame waiting in the queue or being encoded
+        # must not point into them. A buffer comes back here once its frame is
+        # published or replaced, so steady state needs no allocation.
+        self.free_frame_buffers = queue.SimpleQueue()
         self.obstacle_distance = None
-        self.collision_detected = False
-        self.collision_data = None
-        self.vehicle_speed = 0.0
-        self.vehicle_rpm = 0.0
-        self.vehicle_data = None
+        # Collision events from the sensor thread; the publishing thread drains
+        # them once per tick, so an event is never lost or reported twice
+        self.collision_queue = queue.SimpleQueue()
+        # Vehicle dynamics snapshot. update_vehicle_data() builds a new dict and
+        # rebinds the attribute (one atomic store), the publishing thread reads
+        # it once per tick, so speed, RPM and telemetry always come from the
+        # same update without taking a lock. Derived values are computed once
+        # per update, not per publish.
+        self.vehicle_state = {
+            'speed_kmh': 0.0,
+            'speed_ms': 0.0,
+            'rpm': 0.0,
+            'engine_load': 0.0,
+            'telemetry': None
+        }
         
         # Topic names
         self.topics = {
@@ -57,6 +190,16 @@ class ZenohPublisher:
             'vehicle_rpm': f"{base_topic}/dynamics/rpm",
             'vehicle_telemetry': f"{base_topic}/telemetry/full"
         }
+        if raw_camera:
+            # Sirovi frejmovi idu na poseban topic, postojeći JSON potrošači ostaju netaknuti
+            del self.topics['camera_frame']
+            self.topics['camera_frame_raw'] = f"{base_topic}/camera/frame_raw"
+        if tick_message:
+            self.topics['telemetry_tick'] = f"{base_topic}/telemetry/tick"
+        if binary_dynamics:
+            # Binarni format ima svoje topike, JSON potrošači ga nikad ne dobiju
+            self.topics['vehicle_speed'] = f"{base_topic}/dynamics/speed/bin"
+            self.topics['vehicle_rpm'] = f"{base_topic}/dynamics/rpm/bin"
     
     def _setup_logging(self):
         """Setup logging system."""
@@ -74,15 +217,21 @@ class ZenohPublisher:
             bool: True if connection successful, False otherwise
         """
         try:
-            zenoh_config = zenoh.Config()
-            zenoh_config.insert_json5("mode", json.dumps("peer"))
-            zenoh_config.insert_json5("connect/endpoints", json.dumps(["tcp/192.168.33.243:7447"]))
-            self.session = zenoh.open(zenoh_config)
-            self.logger.info("Zenoh session opened successfully")
+            # Session is shared with the ADAS subscriber in this process
+            self.session = acquire_session()
             
             # Declare publishers for each topic
             for topic_name, topic_key in self.topics.items():
-                publisher = self.session.declare_publisher(topic_key)
+                if topic_name in ('camera_frame', 'camera_frame_raw'):
+                    # Camera frames are bulk data: drop under congestion instead
+                    # of blocking, and yield to the small telemetry messages
+                    publisher = self.session.declare_publisher(
+                        topic_key,
+                        congestion_control=zenoh.CongestionControl.DROP,
+                        priority=zenoh.Priority.DATA_LOW
+                    )
+                else:
+                    publisher = self.session.declare_publisher(topic_key)
                 self.publishers[topic_name] = publisher
                 self.logger.info(f"Publisher declared for topic: {topic_key}")
             
@@ -97,36 +246,97 @@ class ZenohPublisher:
         self.stop_publishing()
         
         if self.session:
-            self.session.close()
-            self.logger.info("Zenoh session closed")
+            for publisher in self.publishers.values():
+                publisher.undeclare()
+            self.publishers = {}
+            self.session = None
+            release_session()
     
     def update_camera_frame(self, frame_array):
         """
         Update camera frame data.
         
+        The frame is copied into a publisher-owned buffer, so the caller may
+        reuse frame_array as soon as this returns.
+        
         Args:
             frame_array: Numpy array containing camera image
         """
-        self.current_frame = frame_array
+        frame = self._take_frame_buffer(frame_array)
+        np.copyto(frame, frame_array)
+        try:
+            self.frame_queue.put_nowait(frame)
+        except queue.Full:
+            # Publisher is behind: drop the unsent frame, keep the newest
+            try:
+                self.release_frame_buffer(self.frame_queue.get_nowait())
+            except queue.Empty:
+                pass
+            try:
+                self.frame_queue.put_nowait(frame)
+            except queue.Full:
+                # Another frame won the race; it is just as fresh
+                self.release_frame_buffer(frame)
+    
+    def _take_frame_buffer(self, frame_array):
+        """
+        Get a free publisher-owned buffer matching frame_array.
+        
+        Args:
+            frame_array: Numpy array the buffer must match in shape and dtype
+            
+        Returns:
+            numpy.ndarray: Buffer not referenced by a queued or publishing frame
+        """
+        try:
+            buffer = self.free_frame_buffers.get_nowait()
+            if buffer.shape == frame_array.shape and buffer.dtype == frame_array.dtype:
+                return buffer
+        except queue.Empty:
+            pass
+        # Prvi frejmovi ili promena rezolucije - stari bafer se odbacuje
+        return np.empty_like(frame_array)
+    
+    def release_frame_buffer(self, frame):
+        """
+        Return a frame buffer once its frame is published or dropped.
+        
+        Args:
+            frame: Buffer previously queued by update_camera_frame()
+        """
+        self.free_frame_buffers.put(frame)
     
     def update_obstacle_distance(self, obstacle_data):
         """
         Update obstacle sensor data.
         
         Args:
-            obstacle_data: Dictionary containing obstacle detection data
+            obstacle_data: ObstacleEvent containing obstacle detection data
         """
-        self.obstacle_distance = obstacle_data.get('distance', None)
+        self.obstacle_distance = obstacle_data.distance
     
     def update_collision_status(self, collision_data):
         """
         Update collision sensor data.
         
         Args:
-            collision_data: Dictionary containing collision data
+            collision_data: CollisionEvent containing collision data
         """
-        self.collision_detected = True
-        self.collision_data = collision_data
+        self.collision_queue.put(collision_data)
+    
+    def take_collision(self):
+        """
+        Take the collision events reported since the last call.
+        
+        Returns:
+            CollisionEvent: Most recent collision event, or None if there was none
+        """
+        collision = None
+        while True:
+            try:
+                collision = self.collision_queue.get_nowait()
+            except queue.Empty:
+                return collision
     
     def update_vehicle_data(self, vehicle):
         """
@@ -138,17 +348,25 @@ class ZenohPublisher:
         if vehicle:
             # Calculate speed
             velocity = vehicle.get_velocity()
-            self.vehicle_speed = 3.6 * (velocity.x**2 + velocity.y**2 + velocity.z**2)**0.5
+            speed_kmh = 3.6 * math.hypot(velocity.x, velocity.y, velocity.z)
             
             # Get engine RPM (estimated from speed and throttle)
             control = vehicle.get_control()
             # Rough RPM estimation: idle (800) + speed factor + throttle factor
-            self.vehicle_rpm = 800 + (self.vehicle_speed * 50) + (control.throttle * 2000)
+            rpm = 800 + (speed_kmh * 50) + (control.throttle * 2000)
+            speed_ms = speed_kmh / 3.6
+            engine_load = min(100, (rpm - 800) / 20)  # Estimated load %
             
-            # Store full vehicle data for telemetry
-            self.vehicle_data = {
-                'speed_kmh': self.vehicle_speed,
-                'rpm': self.vehicle_rpm,
+            # Full vehicle data for telemetry. publish_vehicle_telemetry() and
+            # publish_tick() overwrite the timestamp slot in place with the tick
+            # time, so both paths publish the same timestamp (only the
+            # publishing thread touches a snapshot once it is stored)
+            telemetry = {
+                'timestamp': time.time(),
+                'speed_kmh': speed_kmh,
+                'speed_ms': speed_ms,
+                'rpm': rpm,
+                'engine_load': engine_load,
                 'throttle': control.throttle,
                 'brake': control.brake,
                 'steer': control.steer,
@@ -157,143 +375,346 @@ class ZenohPublisher:
                 'manual_gear_shift': control.manual_gear_shift,
                 'gear': control.gear
             }
+            
+            # Publish the new snapshot with a single attribute store
+            self.vehicle_state = {
+                'speed_kmh': speed_kmh,
+                'speed_ms': speed_ms,
+                'rpm': rpm,
+                'engine_load': engine_load,
+                'telemetry': telemetry
+            }
     
-    def publish_camera_frame(self):
-        """Publish camera frame to Zenoh topic."""
-        if self.current_frame is not None:
-            try:
-                # Convert numpy array to base64 encoded string
-                frame_bytes = self.current_frame.tobytes()
-                frame_b64 = base64.b64encode(frame_bytes).decode('utf-8')
-                
-                frame_data = {
-                    'timestamp': time.time(),
-                    'shape': self.current_frame.shape,
-                    'dtype': str(self.current_frame.dtype),
-                    'data': frame_b64
-                }
-                
-                payload = json.dumps(frame_data)
-                self.publishers['camera_frame'].put(payload.encode('utf-8'))
-                
-            except Exception as e:
-                self.logger.error(f"Error publishing camera frame: {e}")
+    def publish_camera_frame(self, timestamp=None):
+        """
+        Publish camera frame to Zenoh topic.
+        
+        Args:
+            timestamp: Message timestamp, shared by all messages of one publish
+                tick (default: current time)
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        try:
+            frame = self.frame_queue.get_nowait()
+        except queue.Empty:
+            return  # No new frame since the last publish
+        
+        try:
+            if self.raw_camera:
+                self.publish_camera_frame_raw(frame, timestamp)
+            else:
+                self._publish_camera_frame_json(frame, timestamp)
+        finally:
+            # The payload is a separate bytes object, the buffer can take the next frame
+            self.release_frame_buffer(frame)
     
-    def publish_obstacle_distance(self):
-        """Publish obstacle distance to Zenoh topic."""
-        if self.obstacle_distance is not None:
+    def _publish_camera_frame_json(self, frame, timestamp):
+        """
+        Publish camera frame as base64 JSON on camera/frame.
+        
+        Args:
+            frame: Numpy array containing camera image
+            timestamp: Message timestamp
+        """
+        try:
+            # Encode straight from the contiguous numpy buffer (no tobytes() copy),
+            # with the SIMD pybase64 encoder when it is installed
+            frame_buffer, codec = self.encode_camera_frame(frame)
+            if PYBASE64_AVAILABLE:
+                frame_b64 = pybase64.b64encode(frame_buffer)
+            else:
+                frame_b64 = base64.b64encode(frame_buffer)
+            
+            # Base64 output is already valid JSON string content, so the message
+            # is assembled around it as bytes instead of decoding it to str and
+            # running the multi-MB string through the JSON encoder
+            header = self.CAMERA_FRAME_HEADER % (timestamp, encode_json(list(frame.shape)),
+                                                 str(frame.dtype).encode('ascii'),
+                                                 codec.encode('ascii'))
+            payload = b''.join((header, frame_b64, b'"}'))
+            self.publishers['camera_frame'].put(payload)
+            
+        except Exception as e:
+            self.logger.error(f"Error publishing camera frame: {e}")
+    
+    def encode_camera_frame(self, frame):
+        """
+        Prepare camera frame pixels for publishing, JPEG-compressed if configured.
+        
+        Args:
+            frame: Numpy array containing RGB camera image
+            
+        Returns:
+            tuple: (contiguous uint8 buffer, codec name 'raw' or 'jpeg')
+        """
+        if self.jpeg_quality is None:
+            return np.ascontiguousarray(frame), 'raw'
+        
+        # Standardni JPEG: cv2 očekuje BGR ulaz. Prijemnik posle cv2.imdecode
+        # konvertuje BGR u RGB, pa oba kodeka daju RGB (vidi decode_jpeg_frame)
+        ok, jpeg = cv2.imencode('.jpg', cv2.cvtColor(frame, cv2.COLOR_RGB2BGR),
+                                [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+        if not ok:
+            raise ValueError("JPEG encoding failed")
+        return jpeg, 'jpeg'
+    
+    def publish_camera_frame_raw(self, frame, timestamp=None):
+        """
+        Publish camera frame as raw pixel bytes, without base64/JSON encoding.
+        
+        Args:
+            frame: Numpy array containing camera image
+            timestamp: Message timestamp (default: current time)
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        try:
+            # Metadata travels in the attachment so the payload is just the pixels
+            frame_buffer, codec = self.encode_camera_frame(frame)
+            channels = frame.shape[2] if frame.ndim == 3 else 1
+            frame_meta = FRAME_META.pack(frame.shape[0], frame.shape[1], channels,
+                                         FRAME_DTYPES.index(str(frame.dtype)),
+                                         FRAME_CODECS.index(codec), timestamp)
+            self.publishers['camera_frame_raw'].put(frame_buffer.tobytes(), attachment=frame_meta)
+            
+        except Exception as e:
+            self.logger.error(f"Error publishing raw camera frame: {e}")
+    
+    def publish_obstacle_distance(self, timestamp=None, obstacle_distance=None):
+        """
+        Publish obstacle distance to Zenoh topic.
+        
+        Args:
+            timestamp: Message timestamp, shared by all messages of one publish
+                tick (default: current time)
+            obstacle_distance: Distance read once for this tick (default: latest)
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        if obstacle_distance is None:
+            obstacle_distance = self.obstacle_distance
+        if obstacle_distance is not None:
             try:
-                distance_data = {
-                    'timestamp': time.time(),
-                    'distance_meters': self.obstacle_distance,
-                    'status': 'detected' if self.obstacle_distance < 40.0 else 'clear'
-                }
-                
-                payload = json.dumps(distance_data)
-                self.publishers['obstacle_distance'].put(payload.encode('utf-8'))
+                status = b'detected' if obstacle_distance < 40.0 else b'clear'
+                if math.isfinite(obstacle_distance):
+                    payload = self.OBSTACLE_TEMPLATE % (timestamp, obstacle_distance, status)
+                else:
+                    payload = encode_json({'timestamp': timestamp, 'distance_meters': None,
+                                           'status': status.decode('ascii')})
+                self.publishers['obstacle_distance'].put(payload)
                 
             except Exception as e:
                 self.logger.error(f"Error publishing obstacle distance: {e}")
     
-    def publish_collision_status(self):
-        """Publish collision detection status to Zenoh topic."""
+    def publish_collision_status(self, timestamp=None, collision=None):
+        """
+        Publish collision detection status to Zenoh topic.
+        
+        Args:
+            timestamp: Message timestamp, shared by all messages of one publish
+                tick (default: current time)
+            collision: Collision event taken for this tick (see take_collision()),
+                or None if there was no collision
+        """
+        if timestamp is None:
+            timestamp = time.time()
         try:
+            collision_detected = collision is not None
             collision_status = {
-                'timestamp': time.time(),
-                'collision_detected': self.collision_detected,
-                'status': 'collision' if self.collision_detected else 'safe'
+                'timestamp': timestamp,
+                'collision_detected': collision_detected,
+                'status': 'collision' if collision_detected else 'safe'
             }
             
-            payload = json.dumps(collision_status)
-            self.publishers['collision_status'].put(payload.encode('utf-8'))
-            
-            # Reset collision flag after publishing
-            if self.collision_detected:
-                self.collision_detected = False
+            payload = encode_json(collision_status)
+            self.publishers['collision_status'].put(payload)
                 
         except Exception as e:
             self.logger.error(f"Error publishing collision status: {e}")
     
-    def publish_collision_data(self):
-        """Publish detailed collision data to Zenoh topic."""
-        if self.collision_data is not None:
+    def publish_collision_data(self, collision):
+        """
+        Publish detailed collision data to Zenoh topic.
+        
+        Args:
+            collision: Collision event taken for this tick, or None
+        """
+        if collision is not None:
             try:
-                payload = json.dumps(self.collision_data)
-                self.publishers['collision_data'].put(payload.encode('utf-8'))
-                
-                # Clear collision data after publishing
-                self.collision_data = None
+                payload = encode_json(collision_to_dict(collision))
+                self.publishers['collision_data'].put(payload)
                 
             except Exception as e:
                 self.logger.error(f"Error publishing collision data: {e}")
     
-    def publish_vehicle_speed(self):
-        """Publish vehicle speed to Zenoh topic."""
+    def publish_vehicle_speed(self, timestamp=None, vehicle_state=None):
+        """
+        Publish vehicle speed to Zenoh topic.
+        
+        Args:
+            timestamp: Message timestamp, shared by all messages of one publish
+                tick (default: current time)
+            vehicle_state: Vehicle snapshot read once for this tick (default: latest)
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        if vehicle_state is None:
+            vehicle_state = self.vehicle_state
         try:
-            speed_data = {
-                'timestamp': time.time(),
-                'speed_kmh': self.vehicle_speed,
-                'speed_ms': self.vehicle_speed / 3.6
-            }
-            
-            payload = json.dumps(speed_data)
-            self.publishers['vehicle_speed'].put(payload.encode('utf-8'))
+            if self.binary_dynamics:
+                payload = DYNAMICS_VALUES.pack(vehicle_state['speed_kmh'], vehicle_state['speed_ms'])
+            elif math.isfinite(vehicle_state['speed_kmh']) and math.isfinite(vehicle_state['speed_ms']):
+                payload = self.SPEED_TEMPLATE % (timestamp, vehicle_state['speed_kmh'],
+                                                 vehicle_state['speed_ms'])
+            else:
+                payload = encode_json({'timestamp': timestamp,
+                                       'speed_kmh': json_number(vehicle_state['speed_kmh']),
+                                       'speed_ms': json_number(vehicle_state['speed_ms'])})
+            self.publishers['vehicle_speed'].put(payload)
             
         except Exception as e:
             self.logger.error(f"Error publishing vehicle speed: {e}")
     
-    def publish_vehicle_rpm(self):
-        """Publish vehicle RPM to Zenoh topic."""
+    def publish_vehicle_rpm(self, timestamp=None, vehicle_state=None):
+        """
+        Publish vehicle RPM to Zenoh topic.
+        
+        Args:
+            timestamp: Message timestamp, shared by all messages of one publish
+                tick (default: current time)
+            vehicle_state: Vehicle snapshot read once for this tick (default: latest)
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        if vehicle_state is None:
+            vehicle_state = self.vehicle_state
         try:
-            rpm_data = {
-                'timestamp': time.time(),
-                'rpm': self.vehicle_rpm,
-                'engine_load': min(100, (self.vehicle_rpm - 800) / 20)  # Estimated load %
-            }
-            
-            payload = json.dumps(rpm_data)
-            self.publishers['vehicle_rpm'].put(payload.encode('utf-8'))
+            if self.binary_dynamics:
+                payload = DYNAMICS_VALUES.pack(vehicle_state['rpm'], vehicle_state['engine_load'])
+            elif math.isfinite(vehicle_state['rpm']) and math.isfinite(vehicle_state['engine_load']):
+                payload = self.RPM_TEMPLATE % (timestamp, vehicle_state['rpm'],
+                                               vehicle_state['engine_load'])
+            else:
+                payload = encode_json({'timestamp': timestamp,
+                                       'rpm': json_number(vehicle_state['rpm']),
+                                       'engine_load': json_number(vehicle_state['engine_load'])})
+            self.publishers['vehicle_rpm'].put(payload)
             
         except Exception as e:
             self.logger.error(f"Error publishing vehicle RPM: {e}")
     
-    def publish_vehicle_telemetry(self):
-        """Publish complete vehicle telemetry to Zenoh topic."""
-        if self.vehicle_data is not None:
+    def publish_vehicle_telemetry(self, timestamp=None, vehicle_state=None):
+        """
+        Publish complete vehicle telemetry to Zenoh topic.
+        
+        Args:
+            timestamp: Message timestamp, shared by all messages of one publish
+                tick (default: current time)
+            vehicle_state: Vehicle snapshot read once for this tick (default: latest)
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        if vehicle_state is None:
+            vehicle_state = self.vehicle_state
+        telemetry_data = vehicle_state['telemetry']
+        if telemetry_data is not None:
             try:
-                telemetry_data = {
-                    'timestamp': time.time(),
-                    **self.vehicle_data
-                }
+                telemetry_data['timestamp'] = timestamp
                 
-                payload = json.dumps(telemetry_data)
-                self.publishers['vehicle_telemetry'].put(payload.encode('utf-8'))
+                payload = encode_json(telemetry_data)
+                self.publishers['vehicle_telemetry'].put(payload)
                 
             except Exception as e:
                 self.logger.error(f"Error publishing vehicle telemetry: {e}")
     
+    def publish_tick(self, timestamp=None):
+        """
+        Publish all non-camera data of this interval as one Zenoh message.
+        
+        Args:
+            timestamp: Message timestamp, shared by all messages of one publish
+                tick (default: current time)
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        # One snapshot of every producer per tick
+        vehicle_state = self.vehicle_state
+        obstacle_distance = self.obstacle_distance
+        collision_event = self.take_collision()
+        try:
+            obstacle = None
+            if obstacle_distance is not None:
+                obstacle = {
+                    'distance_meters': obstacle_distance,
+                    'status': 'detected' if obstacle_distance < 40.0 else 'clear'
+                }
+            collision = None
+            if collision_event is not None:
+                collision = collision_to_dict(collision_event)
+            telemetry_data = vehicle_state['telemetry']
+            if telemetry_data is not None:
+                # Same tick time as telemetry/full, not the update time
+                telemetry_data['timestamp'] = timestamp
+            
+            tick_data = {
+                'timestamp': timestamp,
+                'speed_kmh': vehicle_state['speed_kmh'],
+                'speed_ms': vehicle_state['speed_ms'],
+                'rpm': vehicle_state['rpm'],
+                'engine_load': vehicle_state['engine_load'],
+                'obstacle': obstacle,
+                'collision_detected': collision_event is not None,
+                'collision': collision,
+                'telemetry': telemetry_data
+            }
+            
+            self.publishers['telemetry_tick'].put(encode_json(tick_data))
+            
+        except Exception as e:
+            self.logger.error(f"Error publishing tick data: {e}")
+    
     def _publish_all_data(self):
         """Internal method to publish all data types."""
-        self.publish_camera_frame()
-        self.publish_obstacle_distance()
-        self.publish_collision_status()
-        self.publish_collision_data()
-        self.publish_vehicle_speed()
-        self.publish_vehicle_rpm()
-        self.publish_vehicle_telemetry()
+        # One clock read per tick, shared by every message of this tick
+        timestamp = time.time()
+        self.publish_camera_frame(timestamp)
+        if self.tick_message:
+            self.publish_tick(timestamp)
+            return
+        # One snapshot of every producer per tick; updates that land while the
+        # tick is being published go out with the next one
+        vehicle_state = self.vehicle_state
+        collision = self.take_collision()
+        self.publish_obstacle_distance(timestamp, self.obstacle_distance)
+        self.publish_collision_status(timestamp, collision)
+        self.publish_collision_data(collision)
+        if not self.batch_telemetry:
+            self.publish_vehicle_speed(timestamp, vehicle_state)
+            self.publish_vehicle_rpm(timestamp, vehicle_state)
+        self.publish_vehicle_telemetry(timestamp, vehicle_state)
     
     def _publishing_loop(self):
         """Internal publishing loop that runs in separate thread."""
         self.logger.info(f"Started publishing loop with {self.publish_interval}s interval")
         
+        # Fixed-rate schedule: sleep only for what is left of the interval
+        # after publishing, so publish time does not stretch the period
+        next_tick = time.monotonic()
         while self.running:
             try:
                 self._publish_all_data()
-                time.sleep(self.publish_interval)
                 
             except Exception as e:
                 self.logger.error(f"Error in publishing loop: {e}")
-                time.sleep(self.publish_interval)
+            
+            next_tick += self.publish_interval
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # Fell behind (slow put/encode): restart the schedule instead of bursting
+                next_tick = time.monotonic()
     
     def start_publishing(self):
         """Start periodic publishing in background thread."""
@@ -0,0 +1,75 @@
+"""
+Zenoh Session Module for CARLA
+==============================
+
+This module holds the single Zenoh session shared by the publisher and the
+ADAS subscriber, so the process keeps one connection to the Zenoh router.
+"""
+
+import atexit
+import json
+import logging
+import threading
+
+try:
+    import zenoh
+    ZENOH_AVAILABLE = True
+except ImportError:
+    ZENOH_AVAILABLE = False
+
+# Zenoh router koji koriste svi publisher-i i subscriber-i
+ZENOH_ENDPOINT = "tcp/192.168.33.243:7447"
+
+logger = logging.getLogger(__name__)
+
+_session = None
+_session_users = 0
+_session_lock = threading.Lock()
+
+
+def acquire_session():
+    """
+    Get the shared Zenoh session, opening it on first use.
+
+    Every call must be paired with release_session().
+
+    Returns:
+        zenoh.Session: Shared session instance
+    """
+    global _session, _session_users
+    with _session_lock:
+        if _session is None:
+            zenoh_config = zenoh.Config()
+            zenoh_config.insert_json5("mode", json.dumps("peer"))
+            zenoh_config.insert_json5("connect/endpoints", json.dumps([ZENOH_ENDPOINT]))
+            _session = zenoh.open(zenoh_config)
+            logger.info("Zenoh session opened successfully")
+        _session_users += 1
+        return _session
+
+
+def release_session():
+    """Release the shared session; it is closed when the last user releases it."""
+    global _session, _session_users
+    with _session_lock:
+        if _session is None:
+            return
+        _session_users -= 1
+        if _session_users <= 0:
+            _session.close()
+            _session = None
+            _session_users = 0
+            logger.info("Zenoh session closed")
+
+
+def _close_session_at_exit():
+    """Close the shared session if a user never released it."""
+    global _session, _session_users
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+            _session_users = 0
+
+
+atexit.register(_close_session_at_exit)
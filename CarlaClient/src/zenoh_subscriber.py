@@ -7,7 +7,6 @@ ADAS commands via Zenoh topics and provides simple override functionality.
 """
 
 import time
-import threading
 import json
 import logging
 
@@ -17,29 +16,49 @@ try:
 except ImportError:
     ZENOH_AVAILABLE = False
 
+from .zenoh_session import acquire_session, release_session
 
-def decode_zenoh_payload(payload):
-    """
-    Helper function to decode Zenoh payload that handles both ZBytes and string payloads.
-    
-    Args:
-        payload: Zenoh payload (could be ZBytes or string)
+
+# Payload type is fixed by the installed zenoh version, so it is probed once
+# at import time instead of with hasattr checks on every sample
+if ZENOH_AVAILABLE and hasattr(zenoh, 'ZBytes'):
+    def decode_zenoh_payload(payload):
+        """
+        Decode a Zenoh ZBytes payload (zenoh >= 1.0) to a string.
         
-    Returns:
-        str: Decoded string payload
-    """
-    try:
-        if hasattr(payload, 'to_bytes'):
-            # Handle ZBytes (newer Zenoh versions)
+        Args:
+            payload: Zenoh ZBytes payload
+            
+        Returns:
+            str: Decoded string payload
+        """
+        try:
             return payload.to_bytes().decode('utf-8')
-        elif hasattr(payload, 'decode'):
-            # Handle string payload (older Zenoh versions)
-            return payload.decode('utf-8')
-        else:
-            # Handle already decoded string
-            return str(payload)
-    except Exception as e:
-        raise ValueError(f"Failed to decode Zenoh payload: {e}")
+        except Exception as e:
+            raise ValueError(f"Failed to decode Zenoh payload: {e}")
+else:
+    def decode_zenoh_payload(payload):
+        """
+        Helper function to decode Zenoh payload that handles both ZBytes and string payloads.
+        
+        Args:
+            payload: Zenoh payload (could be ZBytes or string)
+            
+        Returns:
+            str: Decoded string payload
+        """
+        try:
+            if hasattr(payload, 'to_bytes'):
+                # Handle ZBytes (newer Zenoh versions)
+                return payload.to_bytes().decode('utf-8')
+            elif hasattr(payload, 'decode'):
+                # Handle string payload (older Zenoh versions)
+                return payload.decode('utf-8')
+            else:
+                # Handle already decoded string
+                return str(payload)
+        except Exception as e:
+            raise ValueError(f"Failed to decode Zenoh payload: {e}")
 
 
 class ZenohSubscriber:
@@ -58,21 +77,26 @@ class ZenohSubscriber:
         self.session = None
         self.logger = self._setup_logging()
         
-        # ADAS override states
-        self.lane_assist_active = False
-        self.lane_assist_angle = 0.0
-        self.lane_assist_last_update = 0.0
+        # ADAS override states as immutable (active, value, last_update) tuples.
+        # Writers never mutate a tuple, they rebind the attribute to a new one
+        # (a single atomic store), so readers always see a consistent snapshot
+        # without taking a lock.
+        self.lane_assist_state = (False, 0.0, 0.0)
+        self.emergency_brake_state = (False, 0.0, 0.0)
         
-        self.emergency_brake_active = False
-        self.emergency_brake_force = 0.0
-        self.emergency_brake_last_update = 0.0
+        # last_update of the command whose timeout was already logged. Only the
+        # reading (control) thread touches these; the state tuples themselves
+        # are written by the Zenoh handlers alone.
+        self.lane_assist_timeout_logged = None
+        self.emergency_brake_timeout_logged = None
         
         # Timeout settings (seconds)
         self.lane_assist_timeout = 2.0
         self.emergency_brake_timeout = 1.0
         
-        # Thread safety
-        self.lock = threading.Lock()
+        # Emergency brake warnings are rate-limited to every Nth message
+        self.emergency_brake_log_every = 10
+        self.emergency_brake_messages = 0
         
         # Topic names
         self.topics = {
@@ -103,7 +127,8 @@ class ZenohSubscriber:
             return False
             
         try:
-            self.session = zenoh.open(zenoh.Config())
+            # Session is shared with the publisher in this process
+            self.session = acquire_session()
             self.logger.info("ADAS Subscriber: Zenoh session otvoren")
             
             # Setup lane assist subscriber
@@ -113,6 +138,10 @@ class ZenohSubscriber:
             )
             
             # Setup emergency brake subscriber
+            # Latency is set by the publisher: the ADAS node publishing on
+            # adas/es/brake should declare it with priority=zenoh.Priority.REAL_TIME,
+            # congestion_control=zenoh.CongestionControl.DROP and express=True
+            # (no batching). Camera frames stay on DATA_LOW with batching.
             self.subscribers['emergency_brake'] = self.session.declare_subscriber(
                 self.topics['emergency_brake'], 
                 self._emergency_brake_handler
@@ -131,7 +160,11 @@ class ZenohSubscriber:
     def disconnect(self):
         """Disconnect from Zenoh session."""
         if self.session:
-            self.session.close()
+            for subscriber in self.subscribers.values():
+                subscriber.undeclare()
+            self.subscribers = {}
+            self.session = None
+            release_session()
             self.logger.info("ADAS Subscriber: Zenoh session zatvoren")
     
     def _lane_assist_handler(self, sample):
@@ -145,12 +178,10 @@ class ZenohSubscriber:
             payload_str = decode_zenoh_payload(sample.payload)
             data = json.loads(payload_str)
             
-            with self.lock:
-                self.lane_assist_angle = float(data.get('angle', 0.0))
-                self.lane_assist_last_update = time.time()
-                self.lane_assist_active = True
+            angle = float(data.get('angle', 0.0))
+            self.lane_assist_state = (True, angle, time.time())
                 
-            self.logger.info(f"🛣️  Lane Assist: ugao={self.lane_assist_angle:.3f}")
+            self.logger.debug("🛣️  Lane Assist: ugao=%.3f", angle)
             
         except Exception as e:
             self.logger.error(f"ADAS Subscriber: Greška u lane assist podacima: {e}")
@@ -166,35 +197,50 @@ class ZenohSubscriber:
             payload_str = decode_zenoh_payload(sample.payload)
             data = json.loads(payload_str)
             
-            with self.lock:
-                self.emergency_brake_force = float(data.get('brake_force', 0.0))
-                self.emergency_brake_last_update = time.time()
-                self.emergency_brake_active = self.emergency_brake_force > 0.0
+            brake_force = float(data.get('brake_force', 0.0))
+            self.emergency_brake_state = (brake_force > 0.0, brake_force, time.time())
                 
-            if self.emergency_brake_active:
-                self.logger.warning(f"🚨 Emergency Brake: sila={self.emergency_brake_force:.3f}")
+            if brake_force > 0.0:
+                # Prva poruka aktivacije se uvek loguje, zatim svaka N-ta
+                if self.emergency_brake_messages % self.emergency_brake_log_every == 0:
+                    self.logger.warning("🚨 Emergency Brake: sila=%.3f", brake_force)
+                self.emergency_brake_messages += 1
+            else:
+                self.emergency_brake_messages = 0
             
         except Exception as e:
             self.logger.error(f"ADAS Subscriber: Greška u emergency brake podacima: {e}")
     
     def _check_timeouts(self):
-        """Check if ADAS commands have timed out."""
+        """
+        Check if ADAS commands have timed out.
+        
+        The timeout is applied to local copies only; the stored states are
+        never written back here, so a command stored by a Zenoh handler in
+        the meantime cannot be overwritten.
+        
+        Returns:
+            tuple: (lane_assist_state, emergency_brake_state) after timeouts
+        """
         current_time = time.time()
+        lane_assist = self.lane_assist_state
+        emergency_brake = self.emergency_brake_state
         
-        with self.lock:
-            # Check lane assist timeout
-            if self.lane_assist_active:
-                if current_time - self.lane_assist_last_update > self.lane_assist_timeout:
-                    self.lane_assist_active = False
-                    self.lane_assist_angle = 0.0
-                    self.logger.info("🛣️  Lane Assist: Timeout - deaktivirano")
-            
-            # Check emergency brake timeout
-            if self.emergency_brake_active:
-                if current_time - self.emergency_brake_last_update > self.emergency_brake_timeout:
-                    self.emergency_brake_active = False
-                    self.emergency_brake_force = 0.0
-                    self.logger.info("🚨 Emergency Brake: Timeout - deaktivirano")
+        # Check lane assist timeout
+        if lane_assist[0] and current_time - lane_assist[2] > self.lane_assist_timeout:
+            if self.lane_assist_timeout_logged != lane_assist[2]:
+                self.lane_assist_timeout_logged = lane_assist[2]
+                self.logger.info("🛣️  Lane Assist: Timeout - deaktivirano")
+            lane_assist = (False, 0.0, lane_assist[2])
+        
+        # Check emergency brake timeout
+        if emergency_brake[0] and current_time - emergency_brake[2] > self.emergency_brake_timeout:
+            if self.emergency_brake_timeout_logged != emergency_brake[2]:
+                self.emergency_brake_timeout_logged = emergency_brake[2]
+                self.logger.info("🚨 Emergency Brake: Timeout - deaktivirano")
+            emergency_brake = (False, 0.0, emergency_brake[2])
+        
+        return lane_assist, emergency_brake
     
     def get_lane_assist_override(self):
         """
@@ -203,10 +249,8 @@ class ZenohSubscriber:
         Returns:
             tuple: (is_active, angle) - angle to use for steering override
         """
-        self._check_timeouts()
-        
-        with self.lock:
-            return self.lane_assist_active, self.lane_assist_angle
+        lane_assist, _ = self._check_timeouts()
+        return lane_assist[0], lane_assist[1]
     
     def get_emergency_brake_override(self):
         """
@@ -215,10 +259,19 @@ class ZenohSubscriber:
         Returns:
             tuple: (is_active, brake_force) - brake force to use for brake override
         """
-        self._check_timeouts()
+        _, emergency_brake = self._check_timeouts()
+        return emergency_brake[0], emergency_brake[1]
+    
+    def get_overrides(self):
+        """
+        Get lane assist and emergency brake overrides with a single timeout
+        check (used once per control frame).
         
-        with self.lock:
-            return self.emergency_brake_active, self.emergency_brake_force
+        Returns:
+            tuple: (lane_assist_active, angle, emergency_brake_active, brake_force)
+        """
+        lane_assist, emergency_brake = self._check_timeouts()
+        return lane_assist[0], lane_assist[1], emergency_brake[0], emergency_brake[1]
     
     def is_any_system_active(self):
         """
@@ -227,10 +280,8 @@ class ZenohSubscriber:
         Returns:
             bool: True if any ADAS system is active
         """
-        self._check_timeouts()
-        
-        with self.lock:
-            return self.lane_assist_active or self.emergency_brake_active
+        lane_assist, emergency_brake = self._check_timeouts()
+        return lane_assist[0] or emergency_brake[0]
     
     def get_status(self):
         """
@@ -239,21 +290,19 @@ class ZenohSubscriber:
         Returns:
             dict: Current ADAS status information
         """
-        self._check_timeouts()
-        
-        with self.lock:
-            return {
-                'lane_assist': {
-                    'active': self.lane_assist_active,
-                    'angle': self.lane_assist_angle,
-                    'last_update': self.lane_assist_last_update
-                },
-                'emergency_brake': {
-                    'active': self.emergency_brake_active,
-                    'force': self.emergency_brake_force,
-                    'last_update': self.emergency_brake_last_update
-                }
+        lane_assist, emergency_brake = self._check_timeouts()
+        return {
+            'lane_assist': {
+                'active': lane_assist[0],
+                'angle': lane_assist[1],
+                'last_update': lane_assist[2]
+            },
+            'emergency_brake': {
+                'active': emergency_brake[0],
+                'force': emergency_brake[1],
+                'last_update': emergency_brake[2]
             }
+        }
     
     def get_topics(self):
         """Get dictionary of all ADAS topic names."""
@@ -11,31 +11,88 @@ import zenoh
 import json
 import base64
 import numpy as np
+import struct
 import time
 
+try:
+    import pybase64
+    PYBASE64_AVAILABLE = True
+except ImportError:
+    PYBASE64_AVAILABLE = False
 
-def decode_zenoh_payload(payload):
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+
+# Raw camera frame attachment layout (must match zenoh_publisher.FRAME_META)
+FRAME_META = struct.Struct('<IIIIId')
+FRAME_DTYPES = ('uint8', 'uint16', 'float32')
+FRAME_CODECS = ('raw', 'jpeg')
+
+# Binary speed/RPM payload (must match zenoh_publisher.DYNAMICS_VALUES)
+DYNAMICS_VALUES = struct.Struct('<dd')
+
+
+def decode_jpeg_frame(buffer):
     """
-    Helper function to decode Zenoh payload that handles both ZBytes and string payloads.
+    Decode a JPEG-compressed camera frame.
     
     Args:
-        payload: Zenoh payload (could be ZBytes or string)
+        buffer: Bytes-like JPEG data
         
     Returns:
-        str: Decoded string payload
+        numpy.ndarray: Decoded image in RGB channel order, like raw frames
     """
-    try:
-        if hasattr(payload, 'to_bytes'):
-            # Handle ZBytes (newer Zenoh versions)
+    if not CV2_AVAILABLE:
+        raise RuntimeError("JPEG camera frame received but OpenCV is not installed")
+    # cv2.imdecode vraća BGR; konverzija u RGB daje isti redosled kao raw kodek
+    frame_bgr = cv2.imdecode(np.frombuffer(buffer, np.uint8), cv2.IMREAD_COLOR)
+    return cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
+
+
+# Payload type is fixed by the installed zenoh version, so it is probed once
+# at import time instead of with hasattr checks on every sample
+if hasattr(zenoh, 'ZBytes'):
+    def decode_zenoh_payload(payload):
+        """
+        Decode a Zenoh ZBytes payload (zenoh >= 1.0) to a string.
+        
+        Args:
+            payload: Zenoh ZBytes payload
+            
+        Returns:
+            str: Decoded string payload
+        """
+        try:
             return payload.to_bytes().decode('utf-8')
-        elif hasattr(payload, 'decode'):
-            # Handle string payload (older Zenoh versions)
-            return payload.decode('utf-8')
-        else:
-            # Handle already decoded string
-            return str(payload)
-    except Exception as e:
-        raise ValueError(f"Failed to decode Zenoh payload: {e}")
+        except Exception as e:
+            raise ValueError(f"Failed to decode Zenoh payload: {e}")
+else:
+    def decode_zenoh_payload(payload):
+        """
+        Helper function to decode Zenoh payload that handles both ZBytes and string payloads.
+        
+        Args:
+            payload: Zenoh payload (could be ZBytes or string)
+            
+        Returns:
+            str: Decoded string payload
+        """
+        try:
+            if hasattr(payload, 'to_bytes'):
+                # Handle ZBytes (newer Zenoh versions)
+                return payload.to_bytes().decode('utf-8')
+            elif hasattr(payload, 'decode'):
+                # Handle string payload (older Zenoh versions)
+                return payload.decode('utf-8')
+            else:
+                # Handle already decoded string
+                return str(payload)
+        except Exception as e:
+            raise ValueError(f"Failed to decode Zenoh payload: {e}")
 
 
 def main():
@@ -58,9 +115,16 @@ def main():
                 
                 print(f"📷 Camera frame received: {shape}, {dtype}, time: {timestamp}")
                 
-                # Decode base64 image data
-                frame_bytes = base64.b64decode(data['data'])
-                frame_array = np.frombuffer(frame_bytes, dtype=dtype).reshape(shape)
+                # Decode base64 image data (SIMD decoder when pybase64 is installed)
+                if PYBASE64_AVAILABLE:
+                    frame_bytes = pybase64.b64decode(data['data'], validate=False)
+                else:
+                    frame_bytes = base64.b64decode(data['data'])
+                if data.get('codec') == 'jpeg':
+                    # JPEG-compressed frame (ZenohPublisher(jpeg_quality=...)), decodes to RGB
+                    frame_array = decode_jpeg_frame(frame_bytes)
+                else:
+                    frame_array = np.frombuffer(frame_bytes, dtype=dtype).reshape(shape)
                 
                 # Here you could save or process the image
                 # cv2.imshow('CARLA Camera', frame_array)
@@ -68,95 +132,105 @@ def main():
             except Exception as e:
                 print(f"Error processing camera data: {e}")
         
-        # Subscribe to obstacle distance
-        def obstacle_handler(sample):
+        # Subscribe to raw camera frames (ZenohPublisher(raw_camera=True))
+        def camera_raw_handler(sample):
             try:
-                payload_str = decode_zenoh_payload(sample.payload)
-                data = json.loads(payload_str)
-                distance = data['distance_meters']
-                status = data['status']
-                timestamp = data['timestamp']
+                height, width, channels, dtype_code, codec_code, timestamp = FRAME_META.unpack(
+                    sample.attachment.to_bytes())
+                shape = (height, width, channels)
+                dtype = FRAME_DTYPES[dtype_code]
+                if FRAME_CODECS[codec_code] == 'jpeg':
+                    frame_array = decode_jpeg_frame(sample.payload.to_bytes())
+                else:
+                    frame_array = np.frombuffer(sample.payload.to_bytes(), dtype=dtype).reshape(shape)
                 
-                if status == 'detected':
-                    print(f"⚠️  Obstacle: {distance:.1f}m at {timestamp}")
+                print(f"📷 Raw camera frame received: {shape}, {dtype}, time: {timestamp}")
                 
             except Exception as e:
-                print(f"Error processing obstacle data: {e}")
+                print(f"Error processing raw camera data: {e}")
         
-        # Subscribe to collision status
-        def collision_handler(sample):
-            try:
-                payload_str = decode_zenoh_payload(sample.payload)
-                data = json.loads(payload_str)
-                collision_detected = data['collision_detected']
-                timestamp = data['timestamp']
-                
-                if collision_detected:
-                    print(f"💥 COLLISION DETECTED at {timestamp}")
-                
-            except Exception as e:
-                print(f"Error processing collision data: {e}")
+        # JSON topics: each printer receives the already parsed message
+        def print_obstacle(data):
+            if data['status'] == 'detected':
+                print(f"⚠️  Obstacle: {data['distance_meters']:.1f}m at {data['timestamp']}")
         
-        # Subscribe to vehicle speed
-        def speed_handler(sample):
-            try:
-                payload_str = decode_zenoh_payload(sample.payload)
-                data = json.loads(payload_str)
-                speed_kmh = data['speed_kmh']
-                timestamp = data['timestamp']
-                
-                print(f"🚗 Speed: {speed_kmh:.1f} km/h at {timestamp}")
-                
-            except Exception as e:
-                print(f"Error processing speed data: {e}")
+        def print_collision(data):
+            if data['collision_detected']:
+                print(f"💥 COLLISION DETECTED at {data['timestamp']}")
         
-        # Subscribe to vehicle RPM
-        def rpm_handler(sample):
-            try:
-                payload_str = decode_zenoh_payload(sample.payload)
-                data = json.loads(payload_str)
-                rpm = data['rpm']
-                engine_load = data['engine_load']
-                timestamp = data['timestamp']
-                
-                print(f"🔧 RPM: {rpm:.0f}, Load: {engine_load:.1f}% at {timestamp}")
-                
-            except Exception as e:
-                print(f"Error processing RPM data: {e}")
+        def print_speed(data):
+            print(f"🚗 Speed: {data['speed_kmh']:.1f} km/h at {data['timestamp']}")
         
-        # Subscribe to vehicle telemetry
-        def telemetry_handler(sample):
-            try:
-                payload_str = decode_zenoh_payload(sample.payload)
-                data = json.loads(payload_str)
-                speed = data['speed_kmh']
-                throttle = data['throttle']
-                brake = data['brake']
-                steer = data['steer']
-                
-                print(f"📊 Telemetry - Speed: {speed:.1f}km/h, "
-                      f"Throttle: {throttle:.2f}, Brake: {brake:.2f}, Steer: {steer:.2f}")
-                
-            except Exception as e:
-                print(f"Error processing telemetry data: {e}")
+        def print_rpm(data):
+            print(f"🔧 RPM: {data['rpm']:.0f}, Load: {data['engine_load']:.1f}% at {data['timestamp']}")
+        
+        def print_telemetry(data):
+            print(f"📊 Telemetry - Speed: {data['speed_kmh']:.1f}km/h, "
+                  f"Throttle: {data['throttle']:.2f}, Brake: {data['brake']:.2f}, Steer: {data['steer']:.2f}")
+        
+        def print_tick(data):
+            obstacle = data['obstacle']
+            obstacle_text = f"{obstacle['distance_meters']:.1f}m" if obstacle else "none"
+            print(f"⏱️  Tick - Speed: {data['speed_kmh']:.1f} km/h, RPM: {data['rpm']:.0f}, "
+                  f"Obstacle: {obstacle_text}, Collision: {data['collision_detected']} at {data['timestamp']}")
         
-        # Declare subscribers
         base_topic = 'carla/tesla'
+        json_handlers = {
+            f"{base_topic}/sensors/obstacle_distance": print_obstacle,
+            f"{base_topic}/sensors/collision_status": print_collision,
+            f"{base_topic}/dynamics/speed": print_speed,
+            f"{base_topic}/dynamics/rpm": print_rpm,
+            f"{base_topic}/dynamics/speed/bin": print_speed,
+            f"{base_topic}/dynamics/rpm/bin": print_rpm,
+            f"{base_topic}/telemetry/full": print_telemetry,
+            f"{base_topic}/telemetry/tick": print_tick
+        }
+        sample_handlers = {
+            f"{base_topic}/camera/frame": camera_handler,
+            f"{base_topic}/camera/frame_raw": camera_raw_handler
+        }
+        
+        # Binary speed/RPM (ZenohPublisher(binary_dynamics=True)) has its own
+        # .../bin topics and is unpacked into the same fields as the JSON message
+        dynamics_fields = {
+            f"{base_topic}/dynamics/speed/bin": ('speed_kmh', 'speed_ms'),
+            f"{base_topic}/dynamics/rpm/bin": ('rpm', 'engine_load')
+        }
+        
+        def parse_json(key, sample):
+            fields = dynamics_fields.get(key)
+            if fields is not None:
+                data = dict(zip(fields, DYNAMICS_VALUES.unpack(sample.payload.to_bytes())))
+                data['timestamp'] = time.time()
+                return data
+            return json.loads(decode_zenoh_payload(sample.payload))
+        
+        # One wildcard subscriber; messages are routed by key expression
+        def dispatch(sample):
+            key = str(sample.key_expr)
+            handler = json_handlers.get(key)
+            if handler is not None:
+                try:
+                    handler(parse_json(key, sample))
+                except Exception as e:
+                    print(f"Error processing {key}: {e}")
+                return
+            handler = sample_handlers.get(key)
+            if handler is not None:
+                handler(sample)
         
-        camera_sub = session.declare_subscriber(f"{base_topic}/camera/frame", camera_handler)
-        obstacle_sub = session.declare_subscriber(f"{base_topic}/sensors/obstacle_distance", obstacle_handler)
-        collision_sub = session.declare_subscriber(f"{base_topic}/sensors/collision_status", collision_handler)
-        speed_sub = session.declare_subscriber(f"{base_topic}/dynamics/speed", speed_handler)
-        rpm_sub = session.declare_subscriber(f"{base_topic}/dynamics/rpm", rpm_handler)
-        telemetry_sub = session.declare_subscriber(f"{base_topic}/telemetry/full", telemetry_handler)
+        subscriber = session.declare_subscriber(f"{base_topic}/**", dispatch)
         
         print("📡 Subscribed to all CARLA topics:")
         print(f"   📷 Camera: {base_topic}/camera/frame")
+        print(f"   📷 Camera (raw): {base_topic}/camera/frame_raw")
         print(f"   🚧 Obstacle: {base_topic}/sensors/obstacle_distance")
         print(f"   💥 Collision: {base_topic}/sensors/collision_status")
         print(f"   🚗 Speed: {base_topic}/dynamics/speed")
         print(f"   🔧 RPM: {base_topic}/dynamics/rpm")
+        print(f"   🔢 Speed/RPM (binary): {base_topic}/dynamics/speed/bin, {base_topic}/dynamics/rpm/bin")
         print(f"   📊 Telemetry: {base_topic}/telemetry/full")
+        print(f"   ⏱️  Tick (--tick-message): {base_topic}/telemetry/tick")
         print("\n🔄 Listening for data... (Press Ctrl+C to exit)")
         
         try:
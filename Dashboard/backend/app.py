@@ -1,44 +1,138 @@
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Blueprint, jsonify, request, Response, send_from_directory
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+import atexit
 import json
+import logging
+import logging.handlers
+import math
+import os
+import queue
+import struct
 import threading
 import time
 from datetime import datetime
 import zenoh
 
-app = Flask(__name__, 
-            template_folder='../frontend',
-            static_folder='../frontend/static')
-CORS(app)
+try:
+    from waitress import serve
+    WAITRESS_AVAILABLE = True
+except ImportError:
+    WAITRESS_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def encode_json(data):
+    """Serialize data to JSON bytes, with orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data)
+    return json.dumps(data).encode('utf-8')
+
+
+def decode_json(payload):
+    """Parse JSON from bytes or str, with orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider (jsonify, request.get_json) backed by orjson"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+# Zenoh handlers only enqueue log records; a background listener thread does
+# the formatting and the blocking stdout write. Warning changes are INFO and
+# shown by default; per-message speed/RPM records are DEBUG, so the default
+# level skips them before any formatting (DASHBOARD_LOG_LEVEL=DEBUG shows them,
+# WARNING hides the warning changes too).
+logger = logging.getLogger(__name__)
+logger.setLevel(os.environ.get('DASHBOARD_LOG_LEVEL', 'INFO').upper())
+logger.propagate = False
+log_queue = queue.SimpleQueue()
+logger.addHandler(logging.handlers.QueueHandler(log_queue))
+log_output = logging.StreamHandler()
+log_output.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+log_listener = logging.handlers.QueueListener(log_queue, log_output)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+app = Flask(__name__, static_folder='../frontend/static')
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
+
+# JSON API routes; CORS headers are only needed (and only added) here
+api = Blueprint('api', __name__, url_prefix='/api')
+CORS(api)
 
 # Zenoh session (global variable)
 zenoh_session = None
 
+# One backend ingests the CARLA topics and republishes the aggregated state on
+# DASHBOARD_STATE_TOPIC at most every DASHBOARD_STATE_INTERVAL seconds; extra
+# dashboard replicas (DASHBOARD_ZENOH_MODE=replica) subscribe only to that
+DASHBOARD_ZENOH_MODE = os.environ.get('DASHBOARD_ZENOH_MODE', 'ingest')
+DASHBOARD_STATE_TOPIC = 'dashboard/state'
+DASHBOARD_STATE_INTERVAL = 0.05
+
+# Every open /api/stream client holds a server thread for as long as it is
+# connected, so streams are capped below the thread count: the rest of the
+# pool stays free for /api/vehicle-data and /api/update. Clients over the cap
+# get 503 and the dashboard falls back to polling.
+DASHBOARD_THREADS = int(os.environ.get('DASHBOARD_THREADS', 16))
+DASHBOARD_MAX_STREAMS = int(os.environ.get('DASHBOARD_MAX_STREAMS', DASHBOARD_THREADS // 2))
+stream_slots = threading.BoundedSemaphore(DASHBOARD_MAX_STREAMS)
+
+# Payload type is fixed by the installed zenoh version, so it is probed once
+# at import time instead of with hasattr checks on every sample
+if hasattr(zenoh, 'ZBytes'):
+    def zenoh_payload_bytes(payload):
+        """Raw bytes of a Zenoh ZBytes payload (zenoh >= 1.0)"""
+        return payload.to_bytes()
+else:
+    def zenoh_payload_bytes(payload):
+        """Raw bytes of a Zenoh payload (older zenoh: bytes-like or str)"""
+        if isinstance(payload, str):
+            return payload.encode('utf-8')
+        return bytes(payload)
+
 def decode_zenoh_payload(payload):
     """
-    Helper function to decode Zenoh payload that handles both ZBytes and string payloads.
+    Decode a Zenoh payload to a string.
     
     Args:
-        payload: Zenoh payload (could be ZBytes or string)
+        payload: Zenoh payload (ZBytes, bytes or string)
         
     Returns:
         str: Decoded string payload
     """
-    try:
-        if hasattr(payload, 'to_bytes'):
-            # Handle ZBytes (newer Zenoh versions)
-            return payload.to_bytes().decode('utf-8')
-        elif hasattr(payload, 'decode'):
-            # Handle string payload (older Zenoh versions)
-            return payload.decode('utf-8')
-        else:
-            # Handle already decoded string
-            return str(payload)
-    except Exception as e:
-        raise ValueError(f"Failed to decode Zenoh payload: {e}")
+    return zenoh_payload_bytes(payload).decode('utf-8')
+
+# Binary speed/RPM payload from ZenohPublisher(binary_dynamics=True): two
+# little-endian doubles, published on the .../bin topics (JSON stays on
+# dynamics/speed and dynamics/rpm)
+DYNAMICS_VALUES = struct.Struct('<dd')
+
+# Emergency stop distance changes smaller than this (meters) are not pushed
+EMERGENCY_DISTANCE_EPSILON = 0.1
 
 # Global variables to store current vehicle data
-vehicle_data = {
+# Current vehicle data, published as an immutable (version, data) snapshot.
+# A published dict is never mutated: update_vehicle_data() builds a new one and
+# rebinds vehicle_state with a single store, so readers (REST, SSE, timeout
+# checker) take `version, data = vehicle_state` without a lock and always get
+# a consistent pair.
+vehicle_state = (0, {
     'speed': 0,
     'rpm': 0,
     'lane_warning': None,  # 'LEFT' or 'RIGHT' or None
@@ -47,8 +141,43 @@ vehicle_data = {
         'distance': 0
     },
     'pedestrian_warning': None,  # 'LEFT' or 'RIGHT' or None
-    'timestamp': datetime.now().isoformat()
-}
+    # Last update time as integer nanoseconds; formatted to ISO only when the
+    # dashboard reads it, not on every Zenoh message
+    'timestamp_ns': time.time_ns()
+})
+
+# Notified on every vehicle_state change; /api/stream clients wait on the
+# condition instead of polling
+vehicle_data_changed = threading.Condition()
+# (version, JSON bytes) of the last serialized vehicle_data
+vehicle_data_cache = (None, b'')
+# ETag prefix, so a client's ETag from before a restart never matches
+vehicle_data_etag_prefix = f"{time.time_ns():x}"
+
+def update_vehicle_data(**changes):
+    """
+    Publish a new vehicle data snapshot with the given fields changed.
+    
+    Writers are serialized on the condition lock that waking up /api/stream
+    clients needs anyway, so concurrent Zenoh handlers cannot lose each
+    other's updates; readers never take it. Repeated values (e.g. the same
+    lane warning re-sent every frame) do not create a new snapshot, so they
+    cause no SSE push or cache invalidation.
+    
+    Args:
+        **changes: vehicle data fields to replace
+        
+    Returns:
+        bool: True if any field changed
+    """
+    global vehicle_state
+    with vehicle_data_changed:
+        version, data = vehicle_state
+        if all(data[key] == value for key, value in changes.items()):
+            return False
+        vehicle_state = (version + 1, dict(data, timestamp_ns=time.time_ns(), **changes))
+        vehicle_data_changed.notify_all()
+        return True
 
 # Timestamp of last lane warning activity (for auto-clearing)
 last_lane_warning_time = None
@@ -56,40 +185,62 @@ last_lane_warning_time = None
 last_pedestrian_warning_time = None
 
 # Zenoh subscriber handlers
-def speed_handler(sample):
-    """Handle speed data from Zenoh topic"""
+# Speed and RPM arrive at stream rate (every publish tick), so their handlers
+# bind the module-level helpers as default arguments: fast local lookups
+# instead of global lookups on every message. Zenoh passes only the sample.
+def speed_handler(sample, payload_bytes=zenoh_payload_bytes, loads=decode_json,
+                  update=update_vehicle_data):
+    """Handle JSON speed data from Zenoh topic"""
     try:
-        payload_str = decode_zenoh_payload(sample.payload)
-        data = json.loads(payload_str)
-        speed_kmh = data['speed_kmh']
-        timestamp = data['timestamp']
+        speed_kmh = loads(payload_bytes(sample.payload))['speed_kmh']
         
         # Update global vehicle data
-        vehicle_data['speed'] = speed_kmh
-        vehicle_data['timestamp'] = timestamp
+        update(speed=speed_kmh)
         
-        print(f"🚗 Speed: {speed_kmh:.1f} km/h at {timestamp}")
+        logger.debug("🚗 Speed: %.1f km/h", speed_kmh)
         
     except Exception as e:
-        print(f"Error processing speed data: {e}")
+        logger.error("Error processing speed data: %s", e)
 
-def rpm_handler(sample):
-    """Handle RPM data from Zenoh topic"""
+def speed_binary_handler(sample, payload_bytes=zenoh_payload_bytes, unpack=DYNAMICS_VALUES.unpack,
+                         update=update_vehicle_data):
+    """Handle binary (speed_kmh, speed_ms) data from the dynamics/speed/bin topic"""
     try:
-        payload_str = decode_zenoh_payload(sample.payload)
-        data = json.loads(payload_str)
+        speed_kmh, _ = unpack(payload_bytes(sample.payload))
+        update(speed=speed_kmh)
+        
+        logger.debug("🚗 Speed: %.1f km/h", speed_kmh)
+        
+    except Exception as e:
+        logger.error("Error processing binary speed data: %s", e)
+
+def rpm_handler(sample, payload_bytes=zenoh_payload_bytes, loads=decode_json,
+                update=update_vehicle_data):
+    """Handle JSON RPM data from Zenoh topic"""
+    try:
+        data = loads(payload_bytes(sample.payload))
         rpm = data['rpm']
         engine_load = data.get('engine_load', 0)  # Optional field
-        timestamp = data['timestamp']
         
         # Update global vehicle data
-        vehicle_data['rpm'] = rpm
-        vehicle_data['timestamp'] = timestamp
+        update(rpm=rpm)
         
-        print(f"🔧 RPM: {rpm:.0f}, Load: {engine_load:.1f}% at {timestamp}")
+        logger.debug("🔧 RPM: %.0f, Load: %.1f%%", rpm, engine_load)
         
     except Exception as e:
-        print(f"Error processing RPM data: {e}")
+        logger.error("Error processing RPM data: %s", e)
+
+def rpm_binary_handler(sample, payload_bytes=zenoh_payload_bytes, unpack=DYNAMICS_VALUES.unpack,
+                       update=update_vehicle_data):
+    """Handle binary (rpm, engine_load) data from the dynamics/rpm/bin topic"""
+    try:
+        rpm, engine_load = unpack(payload_bytes(sample.payload))
+        update(rpm=rpm)
+        
+        logger.debug("🔧 RPM: %.0f, Load: %.1f%%", rpm, engine_load)
+        
+    except Exception as e:
+        logger.error("Error processing binary RPM data: %s", e)
 
 def pedestrian_warning_handler(sample):
     """Handle pedestrian warning data from Zenoh topic"""
@@ -100,19 +251,16 @@ def pedestrian_warning_handler(sample):
         warning_direction = payload_str.strip().strip('"')  # Remove quotes if present
         
         if warning_direction in ['LEFT', 'RIGHT']:
-            vehicle_data['pedestrian_warning'] = warning_direction
             last_pedestrian_warning_time = time.time()  # Update last activity time
-            print(f"🚶 Pedestrian detected: {warning_direction} side")
+            if update_vehicle_data(pedestrian_warning=warning_direction):
+                logger.info("🚶 Pedestrian detected: %s side", warning_direction)
         else:
-            vehicle_data['pedestrian_warning'] = None
             last_pedestrian_warning_time = None  # Clear timestamp when warning is cleared
-            if warning_direction:  # Only log if there was some content
-                print(f"🚶 Pedestrian warning cleared")
-        
-        vehicle_data['timestamp'] = datetime.now().isoformat()
+            if update_vehicle_data(pedestrian_warning=None):
+                logger.info("🚶 Pedestrian warning cleared")
         
     except Exception as e:
-        print(f"Error processing pedestrian warning data: {e}")
+        logger.error("Error processing pedestrian warning data: %s", e)
 
 def emergency_stop_handler(sample):
     """Handle emergency stop warning data from Zenoh topic"""
@@ -125,25 +273,27 @@ def emergency_stop_handler(sample):
         if distance_str and distance_str != "":
             try:
                 distance = float(distance_str)
-                vehicle_data['emergency_stop'] = {
-                    'active': True,
-                    'distance': distance
-                }
-                print(f"🚨 Emergency stop: Obstacle at {distance:.1f}m")
             except ValueError:
-                print(f"Invalid distance value: {distance_str}")
+                logger.warning("Invalid distance value: %s", distance_str)
+                return
+            current = vehicle_state[1]['emergency_stop']
+            if current['active'] and abs(current['distance'] - distance) < EMERGENCY_DISTANCE_EPSILON:
+                return  # Same obstacle, no visible change
+            update_vehicle_data(emergency_stop={
+                'active': True,
+                'distance': distance
+            })
+            logger.info("🚨 Emergency stop: Obstacle at %.1fm", distance)
         else:
             # Clear emergency stop warning
-            vehicle_data['emergency_stop'] = {
+            if update_vehicle_data(emergency_stop={
                 'active': False,
                 'distance': 0
-            }
-            print(f"✅ Emergency stop warning cleared")
-        
-        vehicle_data['timestamp'] = datetime.now().isoformat()
+            }):
+                logger.info("✅ Emergency stop warning cleared")
         
     except Exception as e:
-        print(f"Error processing emergency stop data: {e}")
+        logger.error("Error processing emergency stop data: %s", e)
 
 def lane_warning_handler(sample):
     """Handle lane warning data from Zenoh topic"""
@@ -154,19 +304,42 @@ def lane_warning_handler(sample):
         warning_direction = payload_str.strip().strip('"')  # Remove quotes if present
         
         if warning_direction in ['LEFT', 'RIGHT']:
-            vehicle_data['lane_warning'] = warning_direction
             last_lane_warning_time = time.time()  # Update last activity time
-            print(f"🛣️  Lane warning: Vehicle approaching {warning_direction} line")
+            if update_vehicle_data(lane_warning=warning_direction):
+                logger.info("🛣️  Lane warning: Vehicle approaching %s line", warning_direction)
         else:
-            vehicle_data['lane_warning'] = None
             last_lane_warning_time = None  # Clear timestamp when warning is cleared
-            if warning_direction:  # Only log if there was some content
-                print(f"🛣️  Lane warning cleared")
+            if update_vehicle_data(lane_warning=None):
+                logger.info("🛣️  Lane warning cleared")
         
-        vehicle_data['timestamp'] = datetime.now().isoformat()
+    except Exception as e:
+        logger.error("Error processing lane warning data: %s", e)
+
+def dashboard_state_handler(sample):
+    """Handle aggregated state republished by the ingesting dashboard (replica mode)"""
+    try:
+        data = decode_json(zenoh_payload_bytes(sample.payload))
+        data.pop('timestamp_ns', None)  # Stamped with the local receive time
+        update_vehicle_data(**data)
         
     except Exception as e:
-        print(f"Error processing lane warning data: {e}")
+        logger.error("Error processing dashboard state: %s", e)
+
+def dashboard_state_publishing_loop(publisher):
+    """Background thread function republishing vehicle data on every change, rate-limited"""
+    published_version = None
+    while True:
+        try:
+            with vehicle_data_changed:
+                vehicle_data_changed.wait_for(lambda: vehicle_state[0] != published_version)
+            published_version, data = vehicle_state
+            publisher.put(encode_json(data))
+            
+        except Exception as e:
+            logger.error("Error publishing dashboard state: %s", e)
+        
+        # Changes within the interval are coalesced into the next message
+        time.sleep(DASHBOARD_STATE_INTERVAL)
 
 def warnings_timeout_checker():
     """Background thread function to clear warnings after 2 seconds of inactivity"""
@@ -174,43 +347,106 @@ def warnings_timeout_checker():
     
     while True:
         try:
+            _, data = vehicle_state
+            
             # Check lane warning timeout
             if (last_lane_warning_time is not None and 
-                vehicle_data['lane_warning'] is not None and 
+                data['lane_warning'] is not None and 
                 time.time() - last_lane_warning_time > 2.0):
                 
                 # Clear the lane warning after 2 seconds of inactivity
-                vehicle_data['lane_warning'] = None
                 last_lane_warning_time = None
-                vehicle_data['timestamp'] = datetime.now().isoformat()
-                print(f"🛣️  Lane warning cleared due to timeout (2s)")
+                update_vehicle_data(lane_warning=None)
+                logger.info("🛣️  Lane warning cleared due to timeout (2s)")
             
             # Check pedestrian warning timeout
             if (last_pedestrian_warning_time is not None and 
-                vehicle_data['pedestrian_warning'] is not None and 
+                data['pedestrian_warning'] is not None and 
                 time.time() - last_pedestrian_warning_time > 2.0):
                 
                 # Clear the pedestrian warning after 2 seconds of inactivity
-                vehicle_data['pedestrian_warning'] = None
                 last_pedestrian_warning_time = None
-                vehicle_data['timestamp'] = datetime.now().isoformat()
-                print(f"🚶 Pedestrian warning cleared due to timeout (2s)")
+                update_vehicle_data(pedestrian_warning=None)
+                logger.info("🚶 Pedestrian warning cleared due to timeout (2s)")
                 
             time.sleep(0.1)  # Check every 100ms for responsiveness
             
         except Exception as e:
-            print(f"Error in warnings timeout checker: {e}")
+            logger.error("Error in warnings timeout checker: %s", e)
             time.sleep(1)  # Wait longer on error
 
 @app.route('/')
 def dashboard():
-    """Serve the main dashboard page"""
-    return render_template('index.html')
+    """Serve the main dashboard page (static file, with ETag/304 support)"""
+    return send_from_directory('../frontend', 'index.html')
+
+def format_timestamp(timestamp_ns):
+    """Format a time.time_ns() value as an ISO 8601 string"""
+    return datetime.fromtimestamp(timestamp_ns / 1e9).isoformat()
 
-@app.route('/api/vehicle-data', methods=['GET'])
+def vehicle_data_to_api(data):
+    """Copy of a vehicle data snapshot in the API format (ISO 'timestamp')"""
+    api_data = dict(data)
+    api_data['timestamp'] = format_timestamp(api_data.pop('timestamp_ns'))
+    return api_data
+
+def vehicle_data_payload():
+    """
+    Serialize the current vehicle data, at most once per change.
+    
+    Returns:
+        tuple: (version, JSON bytes)
+    """
+    global vehicle_data_cache
+    version, data = vehicle_state
+    cached_version, payload = vehicle_data_cache
+    if cached_version != version:
+        payload = encode_json(vehicle_data_to_api(data))
+        vehicle_data_cache = (version, payload)
+    return version, payload
+
+@api.route('/vehicle-data', methods=['GET'])
 def get_vehicle_data():
     """Get current vehicle data for dashboard display"""
-    return jsonify(vehicle_data)
+    version, payload = vehicle_data_payload()
+    response = Response(payload, mimetype='application/json')
+    # Clients revalidate on every poll and get an empty 304 if nothing changed
+    response.set_etag(f"{vehicle_data_etag_prefix}-{version}")
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+@api.route('/stream', methods=['GET'])
+def stream_vehicle_data():
+    """
+    Push vehicle data to the dashboard as Server-Sent Events.
+    
+    A message is sent only when vehicle_data changes; a keep-alive comment
+    is sent every 15 seconds so proxies do not close an idle stream (and a
+    disconnected client is noticed and its slot freed).
+    """
+    if not stream_slots.acquire(blocking=False):
+        return Response("Too many open streams, poll /api/vehicle-data", status=503,
+                        mimetype='text/plain', headers={'Retry-After': '15'})
+    
+    def generate():
+        sent_version = None
+        while True:
+            with vehicle_data_changed:
+                changed = vehicle_data_changed.wait_for(
+                    lambda: vehicle_state[0] != sent_version, timeout=15)
+            if not changed:
+                yield b": keep-alive\n\n"
+                continue
+            # Shared with /api/vehicle-data: all clients reuse one
+            # serialization per change
+            sent_version, payload = vehicle_data_payload()
+            yield b"data: " + payload + b"\n\n"
+    
+    response = Response(generate(), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+    # Called by the server when the stream ends, even if it never started
+    response.call_on_close(stream_slots.release)
+    return response
 
 # Speed and RPM are now updated via Zenoh subscribers
 # @app.route('/api/speed', methods=['POST'])
@@ -295,15 +531,67 @@ def get_vehicle_data():
 #     vehicle_data['timestamp'] = datetime.now().isoformat()
 #     return jsonify({'status': 'success', 'pedestrian_warning': vehicle_data['pedestrian_warning']})
 
-@app.route('/api/clear-warnings', methods=['POST'])
+def is_number(value):
+    """True for a finite int/float JSON value (bool is not a number here)"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+@api.route('/update', methods=['POST'])
+def update_vehicle_data_route():
+    """
+    Update several vehicle data fields with one request
+    Expected data (every field optional):
+    {'speed': float, 'rpm': float, 'lane': 'LEFT'|'RIGHT'|None,
+     'emergency': distance or None, 'pedestrian': 'LEFT'|'RIGHT'|None}
+    
+    Every field is checked before anything is stored: an invalid field or
+    body returns 400 and leaves the vehicle data unchanged.
+    """
+    global last_lane_warning_time, last_pedestrian_warning_time
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'status': 'error', 'message': 'Request body must be a JSON object'}), 400
+    
+    for field in ('speed', 'rpm'):
+        if field in data and not is_number(data[field]):
+            return jsonify({'status': 'error', 'message': f"'{field}' must be a number"}), 400
+    if 'emergency' in data and data['emergency'] is not None and not is_number(data['emergency']):
+        return jsonify({'status': 'error', 'message': "'emergency' must be a number or null"}), 400
+    for field in ('lane', 'pedestrian'):
+        if field in data and data[field] not in ('LEFT', 'RIGHT', None):
+            return jsonify({'status': 'error', 'message': f"'{field}' must be 'LEFT', 'RIGHT' or null"}), 400
+    
+    changes = {}
+    if 'speed' in data:
+        changes['speed'] = data['speed']
+    if 'rpm' in data:
+        changes['rpm'] = data['rpm']
+    if 'lane' in data:
+        # Lane and pedestrian warnings are auto-cleared by the timeout checker
+        changes['lane_warning'] = data['lane']
+        last_lane_warning_time = time.time() if data['lane'] is not None else None
+    if 'emergency' in data:
+        if data['emergency'] is not None:
+            changes['emergency_stop'] = {'active': True, 'distance': float(data['emergency'])}
+        else:
+            changes['emergency_stop'] = {'active': False, 'distance': 0}
+    if 'pedestrian' in data:
+        changes['pedestrian_warning'] = data['pedestrian']
+        last_pedestrian_warning_time = time.time() if data['pedestrian'] is not None else None
+    
+    # All fields of the request land in one snapshot
+    update_vehicle_data(**changes)
+    return jsonify({'status': 'success'})
+
+@api.route('/clear-warnings', methods=['POST'])
 def clear_warnings():
     """Clear all active warnings"""
-    vehicle_data['lane_warning'] = None
-    vehicle_data['emergency_stop'] = {'active': False, 'distance': 0}
-    vehicle_data['pedestrian_warning'] = None
-    vehicle_data['timestamp'] = datetime.now().isoformat()
+    update_vehicle_data(lane_warning=None,
+                        emergency_stop={'active': False, 'distance': 0},
+                        pedestrian_warning=None)
     return jsonify({'status': 'success'})
 
+app.register_blueprint(api)
+
 # Placeholder functions for network data reception
 def receive_lane_detection_data():
     """
@@ -334,11 +622,10 @@ def send_warning_data(warning_type, distance):
     Placeholder function for processing warning data
     """
     if warning_type == "OBSTACLE":
-        vehicle_data['emergency_stop'] = {
+        update_vehicle_data(emergency_stop={
             'active': True,
             'distance': distance
-        }
-        vehicle_data['timestamp'] = datetime.now().isoformat()
+        })
 
 def initialize_zenoh():
     """Initialize Zenoh session and subscribers"""
@@ -351,11 +638,29 @@ def initialize_zenoh():
         zenoh_config = zenoh.Config()
         zenoh_config.insert_json5("mode", json.dumps("peer"))
         zenoh_config.insert_json5("connect/endpoints", json.dumps(["tcp/192.168.33.243:7447"]))
+        # Warnings must not be dropped under a burst: wait up to 50 ms (instead
+        # of the default 1 ms) for queue space before a message queued by this
+        # session is dropped. Publishers of the warning topics need the same
+        # setting on their side.
+        zenoh_config.insert_json5("transport/link/tx/queue/congestion_control/drop/wait_before_drop",
+                                  json.dumps(50000))
+        zenoh_config.insert_json5("transport/link/tx/queue/congestion_control/drop/max_wait_before_drop_fragments",
+                                  json.dumps(250000))
+        # Only small speed/RPM/warning messages arrive here; the link batch size
+        # is negotiated down to the smaller side, so they are not held back
+        # filling large batches
+        zenoh_config.insert_json5("transport/link/tx/batch_size", json.dumps(4096))
         
         # Open Zenoh session with configuration
         zenoh_session = zenoh.open(zenoh_config)
         print("✅ Connected to Zenoh")
         
+        if DASHBOARD_ZENOH_MODE == 'replica':
+            print(f"📡 Replica mode - subscribing to {DASHBOARD_STATE_TOPIC}")
+            zenoh_session.declare_subscriber(DASHBOARD_STATE_TOPIC, dashboard_state_handler)
+            print("🔄 Listening for dashboard state...")
+            return True
+        
         # Define the base topic
         base_topic = 'carla/tesla'
         
@@ -373,6 +678,11 @@ def initialize_zenoh():
         print(f"   🔧 RPM: {rpm_topic}")
         rpm_sub = zenoh_session.declare_subscriber(rpm_topic, rpm_handler)
         
+        # Binary speed/RPM (CarlaClient main.py --binary-dynamics)
+        print(f"   🔢 Speed/RPM (binary): {speed_topic}/bin, {rpm_topic}/bin")
+        speed_bin_sub = zenoh_session.declare_subscriber(f"{speed_topic}/bin", speed_binary_handler)
+        rpm_bin_sub = zenoh_session.declare_subscriber(f"{rpm_topic}/bin", rpm_binary_handler)
+        
         print(f"   🚶 Pedestrian: {pedestrian_topic}")
         pedestrian_sub = zenoh_session.declare_subscriber(pedestrian_topic, pedestrian_warning_handler)
         
@@ -382,6 +692,13 @@ def initialize_zenoh():
         print(f"   🛣️  Lane Warning: {lane_topic}")
         lane_sub = zenoh_session.declare_subscriber(lane_topic, lane_warning_handler)
         
+        # Republish the aggregated state for dashboard replicas
+        print(f"   📤 Dashboard state: {DASHBOARD_STATE_TOPIC}")
+        state_publisher = zenoh_session.declare_publisher(DASHBOARD_STATE_TOPIC)
+        state_thread = threading.Thread(target=dashboard_state_publishing_loop,
+                                        args=(state_publisher,), daemon=True)
+        state_thread.start()
+        
         print("✅ Zenoh subscribers initialized successfully!")
         print("🔄 Listening for CARLA data...")
         return True
@@ -391,31 +708,45 @@ def initialize_zenoh():
         print("Dashboard will continue without Zenoh integration")
         return False
 
+def start_background_services():
+    """Start the Zenoh subscribers and the warnings timeout checker"""
+    # Zenoh is initialized before the server starts, in the serving process,
+    # so no data is missed at startup and only one session is ever opened
+    initialize_zenoh()
+    
+    # Start warnings timeout checker thread
+    timeout_thread = threading.Thread(target=warnings_timeout_checker, daemon=True)
+    timeout_thread.start()
+
 if __name__ == '__main__':
     print("Starting Vehicle Dashboard Server...")
     print("Dashboard available at: http://localhost:5000")
     print("\nZenoh Integration:")
     print("- Speed topic: carla/tesla/dynamics/speed")
     print("- RPM topic: carla/tesla/dynamics/rpm")
+    print("- Binary speed/RPM topics: carla/tesla/dynamics/speed/bin, carla/tesla/dynamics/rpm/bin")
     print("- Pedestrian warnings: carla/tesla/warnings/pedestrian")
     print("- Emergency stop: carla/tesla/warnings/emergency_stop")
     print("- Lane warnings: carla/tesla/warnings/lane")
+    print(f"- Aggregated state (republished): {DASHBOARD_STATE_TOPIC}")
+    print(f"- Mode: {DASHBOARD_ZENOH_MODE} (set DASHBOARD_ZENOH_MODE=replica to follow another dashboard)")
     print("\nAPI Endpoints:")
     print("- GET /api/vehicle-data - Get current vehicle data")
+    print("- GET /api/stream - Vehicle data push stream (Server-Sent Events)")
+    print("- POST /api/update - Update several vehicle data fields at once")
     print("- POST /api/clear-warnings - Clear all warnings")
     print("\nNote: Speed, RPM, Pedestrian warnings, Emergency stop, and Lane warnings are now updated automatically via Zenoh subscribers")
     print("Lane and Pedestrian warnings will be automatically cleared after 2 seconds of inactivity")
+    print("Set DASHBOARD_LOG_LEVEL=DEBUG to also log every speed/RPM message (WARNING: errors only)")
     
-    # Initialize Zenoh in a separate thread to avoid blocking Flask startup
-    def init_zenoh_thread():
-        time.sleep(1)  # Give Flask a moment to start
-        initialize_zenoh()
-    
-    zenoh_thread = threading.Thread(target=init_zenoh_thread, daemon=True)
-    zenoh_thread.start()
-    
-    # Start warnings timeout checker thread
-    timeout_thread = threading.Thread(target=warnings_timeout_checker, daemon=True)
-    timeout_thread.start()
+    start_background_services()
     
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    if WAITRESS_AVAILABLE:
+        # Production WSGI server: requests (and open /api/stream clients) are
+        # served concurrently by a thread pool, with no reloader process
+        print(f"Serving with waitress ({DASHBOARD_THREADS} threads, "
+              f"at most {DASHBOARD_MAX_STREAMS} for /api/stream)")
+        serve(app, host='0.0.0.0', port=5000, threads=DASHBOARD_THREADS)
+    else:
+        print("waitress not installed - using the Flask development server")
+        app.run(debug=False, threaded=True, host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -0,0 +1,18 @@
+"""
+WSGI entry point for the Vehicle Dashboard backend.
+
+Vehicle data lives in the process, so run a single worker and scale with threads:
+
+    gunicorn -w 1 --threads 16 -b 0.0.0.0:5000 wsgi:app
+
+Each open /api/stream client holds one of these threads. Open streams are
+capped at DASHBOARD_MAX_STREAMS (default: half of DASHBOARD_THREADS, 16), so
+when changing --threads set DASHBOARD_THREADS to the same value.
+
+Do not use --preload: the Zenoh session is opened when the worker imports this
+module and would not survive gunicorn forking the worker from the master.
+"""
+
+from app import app, start_background_services
+
+start_background_services()
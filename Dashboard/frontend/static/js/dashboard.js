@@ -2,6 +2,7 @@
 class VehicleDashboard {
     constructor() {
         this.websocket = null;
+        this.eventSource = null;
         this.isConnected = false;
         this.currentData = {
             speed: 0,
@@ -17,8 +18,8 @@ class VehicleDashboard {
     init() {
         this.initializeElements();
         this.initializeEventListeners();
-        this.startDataPolling();
         this.updateConnectionStatus(false);
+        this.startDataStream();
     }
 
     initializeElements() {
@@ -64,6 +65,32 @@ class VehicleDashboard {
         // Dashboard is now view-only, no test controls
     }
 
+    startDataStream() {
+        // Server pushes data only when it changes; fall back to polling
+        // in browsers without Server-Sent Events
+        if (!window.EventSource) {
+            this.startDataPolling();
+            return;
+        }
+        
+        this.eventSource = new EventSource('/api/stream');
+        this.eventSource.onopen = () => this.updateConnectionStatus(true);
+        this.eventSource.onmessage = (event) => {
+            this.updateDashboard(JSON.parse(event.data));
+            this.updateConnectionStatus(true);
+        };
+        // EventSource reconnects on its own after a dropped connection; it
+        // gives up (CLOSED) when the server refuses the stream, e.g. 503 when
+        // too many streams are open, so switch to polling then
+        this.eventSource.onerror = () => {
+            this.updateConnectionStatus(false);
+            if (this.eventSource.readyState === EventSource.CLOSED) {
+                this.eventSource = null;
+                this.startDataPolling();
+            }
+        };
+    }
+
     startDataPolling() {
         // Poll for data every 100ms
         setInterval(() => {
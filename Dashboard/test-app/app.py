@@ -1,5 +1,6 @@
 from flask import Flask, render_template, request, jsonify
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import threading
 import time
@@ -10,6 +11,11 @@ app = Flask(__name__)
 # Dashboard API URL
 DASHBOARD_URL = "http://localhost:5000"
 
+# One keep-alive connection pool for all calls to the dashboard, instead of
+# a new TCP connection per request
+SESSION = requests.Session()
+SESSION.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=32))
+
 @app.route('/')
 def test_interface():
     """Serve the test interface"""
@@ -22,7 +28,7 @@ def send_speed():
     speed = data.get('speed', 0)
     
     try:
-        response = requests.post(f"{DASHBOARD_URL}/api/speed", 
+        response = SESSION.post(f"{DASHBOARD_URL}/api/speed", 
                                json={"speed": speed}, 
                                timeout=2)
         return jsonify({"status": "success", "speed": speed})
@@ -36,7 +42,7 @@ def send_rpm():
     rpm = data.get('rpm', 0)
     
     try:
-        response = requests.post(f"{DASHBOARD_URL}/api/rpm", 
+        response = SESSION.post(f"{DASHBOARD_URL}/api/rpm", 
                                json={"rpm": rpm}, 
                                timeout=2)
         return jsonify({"status": "success", "rpm": rpm})
@@ -50,7 +56,7 @@ def send_lane_warning():
     direction = data.get('direction')
     
     try:
-        response = requests.post(f"{DASHBOARD_URL}/api/lane-assist", 
+        response = SESSION.post(f"{DASHBOARD_URL}/api/lane-assist", 
                                json={"direction": direction}, 
                                timeout=2)
         return jsonify({"status": "success", "direction": direction})
@@ -64,7 +70,7 @@ def send_emergency():
     distance = data.get('distance', 0)
     
     try:
-        response = requests.post(f"{DASHBOARD_URL}/api/emergency-stop", 
+        response = SESSION.post(f"{DASHBOARD_URL}/api/emergency-stop", 
                                json={"type": "OBSTACLE", "distance": distance}, 
                                timeout=2)
         return jsonify({"status": "success", "distance": distance})
@@ -78,7 +84,7 @@ def send_pedestrian():
     direction = data.get('direction')
     
     try:
-        response = requests.post(f"{DASHBOARD_URL}/api/pedestrian-detect", 
+        response = SESSION.post(f"{DASHBOARD_URL}/api/pedestrian-detect", 
                                json={"direction": direction}, 
                                timeout=2)
         return jsonify({"status": "success", "direction": direction})
@@ -89,7 +95,7 @@ def send_pedestrian():
 def clear_warnings():
     """Clear all warnings on dashboard"""
     try:
-        response = requests.post(f"{DASHBOARD_URL}/api/clear-warnings", 
+        response = SESSION.post(f"{DASHBOARD_URL}/api/clear-warnings", 
                                json={}, 
                                timeout=2)
         return jsonify({"status": "success"})
@@ -100,42 +106,32 @@ def clear_warnings():
 def start_simulation():
     """Start driving simulation"""
     def simulate_driving():
+        emergency_ticks = 0  # Seconds left until the emergency warning is cleared
         for i in range(60):  # 60 second simulation
             try:
-                # Random speed and RPM
-                speed = random.randint(30, 120)
-                rpm = random.randint(1500, 5000)
-                
-                # Update speed and RPM
-                requests.post(f"{DASHBOARD_URL}/api/speed", 
-                            json={"speed": speed}, timeout=1)
-                requests.post(f"{DASHBOARD_URL}/api/rpm", 
-                            json={"rpm": rpm}, timeout=1)
+                # Random speed and RPM; everything for this second goes in one request
+                payload = {
+                    "speed": random.randint(30, 120),
+                    "rpm": random.randint(1500, 5000)
+                }
                 
-                # Random ADAS events
+                # Random ADAS events (lane and pedestrian warnings are
+                # cleared by the dashboard after 2 seconds)
                 if random.random() < 0.1:  # 10% chance
-                    direction = random.choice(["LEFT", "RIGHT"])
-                    requests.post(f"{DASHBOARD_URL}/api/lane-assist", 
-                                json={"direction": direction}, timeout=1)
-                    time.sleep(2)  # Show warning for 2 seconds
-                    requests.post(f"{DASHBOARD_URL}/api/lane-assist", 
-                                json={"direction": None}, timeout=1)
+                    payload["lane"] = random.choice(["LEFT", "RIGHT"])
                 
-                if random.random() < 0.05:  # 5% chance
-                    distance = random.uniform(5, 30)
-                    requests.post(f"{DASHBOARD_URL}/api/emergency-stop", 
-                                json={"type": "OBSTACLE", "distance": distance}, timeout=1)
-                    time.sleep(3)  # Show warning for 3 seconds
-                    requests.post(f"{DASHBOARD_URL}/api/emergency-stop", 
-                                json={"type": None, "distance": 0}, timeout=1)
+                if emergency_ticks:
+                    emergency_ticks -= 1
+                    if emergency_ticks == 0:
+                        payload["emergency"] = None
+                elif random.random() < 0.05:  # 5% chance
+                    payload["emergency"] = random.uniform(5, 30)
+                    emergency_ticks = 3  # Show warning for 3 seconds
                 
                 if random.random() < 0.03:  # 3% chance
-                    direction = random.choice(["LEFT", "RIGHT"])
-                    requests.post(f"{DASHBOARD_URL}/api/pedestrian-detect", 
-                                json={"direction": direction}, timeout=1)
-                    time.sleep(2)  # Show warning for 2 seconds
-                    requests.post(f"{DASHBOARD_URL}/api/pedestrian-detect", 
-                                json={"direction": None}, timeout=1)
+                    payload["pedestrian"] = random.choice(["LEFT", "RIGHT"])
+                
+                SESSION.post(f"{DASHBOARD_URL}/api/update", json=payload, timeout=1)
                 
                 time.sleep(1)
             except:
@@ -143,7 +139,7 @@ def start_simulation():
         
         # Clear all warnings at the end
         try:
-            requests.post(f"{DASHBOARD_URL}/api/clear-warnings", timeout=1)
+            SESSION.post(f"{DASHBOARD_URL}/api/clear-warnings", timeout=1)
         except:
             pass
     
@@ -157,7 +153,7 @@ def start_simulation():
 def check_dashboard():
     """Check if dashboard is accessible"""
     try:
-        response = requests.get(f"{DASHBOARD_URL}/api/vehicle-data", timeout=2)
+        response = SESSION.get(f"{DASHBOARD_URL}/api/vehicle-data", timeout=2)
         return jsonify({"status": "connected", "dashboard_url": DASHBOARD_URL})
     except requests.exceptions.RequestException as e:
         return jsonify({"status": "disconnected", "error": str(e)}), 500
@@ -172,4 +168,4 @@ if __name__ == '__main__':
     print("Press Ctrl+C to stop")
     print("")
     
-    app.run(debug=True, host='0.0.0.0', port=5001)
\ No newline at end of file
+    app.run(debug=False, threaded=True, host='0.0.0.0', port=5001)
\ No newline at end of file